@@ -1,59 +1,26 @@
+import os
 import sys
 import cv2
 import numpy as np
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QFileDialog, QListWidget, QListWidgetItem, QSlider, QGroupBox, QFormLayout, 
-    QSpinBox, QFrame, QDoubleSpinBox, QScrollArea, QComboBox
+    QFileDialog, QListWidget, QListWidgetItem, QSlider, QGroupBox,
+    QFrame, QScrollArea, QComboBox, QStackedWidget
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QImage, QFont
+from PySide6.QtCore import Qt, QTimer, Signal
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
-METHODS = [
-    "Image Negative",
-    "Grayscale",
-    "Histogram Equalization",
-    "Threshold (Binary)",
-    "Blurring/Smoothing",
-    "Edge Detection",  # Menggabungkan berbagai jenis edge detection
-    "Morphology (Open)",
-    "Morphology (Close)",
-    "Dilation",
-    "Erosion",
-    "Brightness/Contrast Adjustment",
-    "Sharpen / Contrast"
-]
-
-METHOD_DESCRIPTIONS = {
-    "Image Negative": "Membalik nilai piksel (Invert)",
-    "Grayscale": "Konversi gambar ke skala abu-abu",
-    "Histogram Equalization": "Pemerataan histogram standar",
-    "Threshold (Binary)": "Konversi ke gambar biner hitam-putih",
-    "Blurring/Smoothing": "Berbagai teknik blur dan smoothing gambar",
-    "Edge Detection": "Berbagai teknik deteksi tepi pada gambar",
-    "Morphology (Open)": "Operasi morfologi opening",
-    "Morphology (Close)": "Operasi morfologi closing",
-    "Dilation": "Operasi dilasi (memperbesar objek)",
-    "Erosion": "Operasi erosi (memperkecil objek)",
-    "Brightness/Contrast Adjustment": "Penyesuaian brightness dan contrast",
-    "Sharpen / Contrast": "Penajaman dan peningkatan kontras"
-}
-
-def qimg_from_cv(img):
-    """Convert an OpenCV image (BGR or gray) to QImage"""
-    if img is None:
-        return None
-    if len(img.shape) == 2:  # grayscale
-        h, w = img.shape
-        bytes_per_line = w
-        return QImage(img.data, w, h, bytes_per_line, QImage.Format_Grayscale8).copy()
-    else:
-        h, w, ch = img.shape
-        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        bytes_per_line = 3 * w
-        return QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888).copy()
+from colorimage import GRAY, ColorImage
+from workingset import WorkingSet
+from operations import OPERATIONS
+from panels import COMBO_STYLE, ParamPanel
+from session import SESSION_ENV, SessionRecorder, load_manifest, prepare_pipeline, run_pipeline
+from dataset_stats import StatsAccumulator
+from viewer import PyramidViewer
+from compare import COMPARE_MODES, CompareViewer, DifferenceStatsJob, QualityReportJob, format_stats
+from approx import DRAFT, QUALITY_MODES, format_report, sample_crop, timed
+from scheduler import INTERACTIVE, estimate_memory, estimate_pipeline_memory, format_queue, get_scheduler
 
 class HistogramCanvas(FigureCanvas):
     def __init__(self, parent=None, width=4, height=2, dpi=100):
@@ -65,6 +32,7 @@ class HistogramCanvas(FigureCanvas):
         fig.tight_layout()
 
     def plot_hist(self, img, per_channel=True):
+        """Plot the histogram of a ColorImage (or BGR/gray array) from its cached counts"""
         self.ax.clear()
         if img is None:
             self.ax.text(0.5, 0.5, 'No Image', horizontalalignment='center', 
@@ -77,21 +45,30 @@ class HistogramCanvas(FigureCanvas):
             self.draw()
             return
         
-        if len(img.shape) == 2 or not per_channel:
-            # grayscale histogram
-            gray = img if len(img.shape) == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            self.ax.hist(gray.ravel(), bins=256, range=(0,255), color='#495057', alpha=0.7)
-            self.ax.set_title("Grayscale Histogram", fontsize=10, fontweight='bold', color='#343a40')
+        # Histogram diambil dari cache ColorImage (gray/analysis dipakai bersama processing)
+        img = ColorImage.wrap(img)
+        if img.space == GRAY or not per_channel:
+            self.plot_counts(img.histogram(), "Grayscale Histogram")
+        else:
+            self.plot_counts(img.channel_histograms(), "Color Histogram")
+
+    def plot_counts(self, hist, title="Dataset Histogram"):
+        """Plot precomputed 256-bin counts (1 x 256 gray or 3 x 256 BGR)"""
+        self.ax.clear()
+        hist = np.asarray(hist)
+        levels = np.arange(256)
+        if hist.ndim == 1:
+            self.ax.hist(levels, bins=256, range=(0,255), weights=hist, color='#495057', alpha=0.7)
         else:
-            # color histogram per channel
-            chans = cv2.split(img)
             colors = ('#4285f4', '#34a853', '#ea4335')  # Blue, Green, Red
             labels = ('Blue', 'Green', 'Red')
-            for ch, col, lbl in zip(chans, colors, labels):
-                self.ax.hist(ch.ravel(), bins=256, range=(0,255), alpha=0.7, color=col, label=lbl)
+            for counts, col, lbl in zip(hist, colors, labels):
+                self.ax.hist(levels, bins=256, range=(0,255), weights=counts, alpha=0.7, color=col, label=lbl)
             self.ax.legend(fontsize=8, loc='upper right')
-            self.ax.set_title("Color Histogram", fontsize=10, fontweight='bold', color='#343a40')
-        
+        self.ax.set_title(title, fontsize=10, fontweight='bold', color='#343a40')
+        self._finish_axes()
+
+    def _finish_axes(self):
         self.ax.set_xlim(0, 255)
         self.ax.grid(True, alpha=0.3)
         self.ax.set_facecolor('#f8f9fa')
@@ -99,12 +76,43 @@ class HistogramCanvas(FigureCanvas):
         self.draw()
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # (generation, (result, elapsed, feedback) atau exception) dari thread scheduler
+    applied = Signal(int, object)
+
+    def __init__(self, scratch_dir=None, session_path=None):
         super().__init__()
         self.setWindowTitle("Image Processing App - Enhanced (12 Fitur) - PySide6 + OpenCV")
-        self.orig = None  # original cv image (BGR)
-        self.result = None  # result cv image (BGR or gray)
+        # orig/result/intermediates disimpan sebagai memory-mapped file (read-only)
+        self.store = WorkingSet(scratch_dir)
+        # ColorImage per stored array: konversi warna & histogram di-cache per versi gambar
+        self._images = {}
+        # Semua operasi yang di-apply dicatat (disimpan otomatis bila IMGPROC_SESSION di-set)
+        self.session = SessionRecorder(session_path or os.environ.get(SESSION_ENV))
+        self.image_path = None
+        # Apply berjalan di scheduler (prioritas interaktif); hasil yang sudah usang dibuang
+        self.scheduler = get_scheduler()
+        self._apply_generation = 0
+        self._pending_apply = None
         self._setup_ui()
+        self.applied.connect(self._on_applied)
+
+    @property
+    def orig(self):
+        """Original cv image (BGR), read-only"""
+        return self.store.get("orig")
+
+    @orig.setter
+    def orig(self, img):
+        self.store.put("orig", img)
+
+    @property
+    def result(self):
+        """Result cv image (BGR or gray), read-only"""
+        return self.store.get("result")
+
+    @result.setter
+    def result(self, img):
+        self.store.put("result", img)
 
     def _setup_ui(self):
         main_widget = QWidget()
@@ -186,8 +194,11 @@ class MainWindow(QMainWindow):
         btn_load = QPushButton("📁 Load Image")
         btn_save = QPushButton("💾 Save Result")
         btn_reset = QPushButton("🔄 Reset")
+        btn_dataset = QPushButton("📊 Dataset Histogram")
+        btn_save_session = QPushButton("📝 Save Session")
+        btn_load_session = QPushButton("▶️ Load Session")
         
-        for btn in [btn_load, btn_save, btn_reset]:
+        for btn in [btn_load, btn_save, btn_reset, btn_dataset, btn_save_session, btn_load_session]:
             btn.setStyleSheet("""
                 QPushButton {
                     background-color: #ffffff;
@@ -208,15 +219,29 @@ class MainWindow(QMainWindow):
         btn_load.clicked.connect(self.load_image)
         btn_save.clicked.connect(self.save_result)
         btn_reset.clicked.connect(self.reset)
+        btn_dataset.clicked.connect(self.load_dataset_histogram)
+        btn_save_session.clicked.connect(self.save_session)
+        btn_load_session.clicked.connect(self.load_session)
         
         file_layout.addWidget(btn_load)
         file_layout.addWidget(btn_save)
         file_layout.addWidget(btn_reset)
+        file_layout.addWidget(btn_dataset)
+        session_row = QHBoxLayout()
+        session_row.addWidget(btn_save_session)
+        session_row.addWidget(btn_load_session)
+        file_layout.addLayout(session_row)
+        
+        # Label pemakaian memori working set
+        self.mem_label = QLabel(self.store.describe())
+        self.mem_label.setWordWrap(True)
+        self.mem_label.setStyleSheet("color: #6c757d; font-size: 10px;")
+        file_layout.addWidget(self.mem_label)
         file_group.setLayout(file_layout)
         left_layout.addWidget(file_group)
         
         # Processing Methods Group
-        method_group = QGroupBox("⚙️ Processing Methods (12 Fitur)")
+        method_group = QGroupBox(f"⚙️ Processing Methods ({len(OPERATIONS)} Fitur)")
         method_group.setStyleSheet(file_group.styleSheet())
         method_layout = QVBoxLayout()
         method_layout.setSpacing(10)
@@ -274,240 +299,31 @@ class MainWindow(QMainWindow):
             }
         """)
         
-        for method in METHODS:
-            item = QListWidgetItem(method)
+        for op in OPERATIONS:
+            item = QListWidgetItem(op.name)
             self.method_list.addItem(item)
         
         self.method_list.itemSelectionChanged.connect(self.method_changed)
-        self.method_list.setCurrentRow(0)
         method_layout.addWidget(self.method_list)
         
-        # Parameter Container - untuk menampung semua kontrol parameter
-        self.param_container = QWidget()
-        self.param_layout = QVBoxLayout(self.param_container)
-        self.param_layout.setSpacing(8)
-        self.param_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Blur Type ComboBox
-        self.blur_type_widget = QWidget()
-        blur_type_layout = QHBoxLayout(self.blur_type_widget)
-        blur_type_label = QLabel("Blur Type:")
-        blur_type_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.blur_type_combo = QComboBox()
-        self.blur_type_combo.addItems(["Gaussian Blur", "Median Blur", "Mean Blur", "Bilateral Filter"])
-        self.blur_type_combo.setStyleSheet("""
-            QComboBox {
-                border: 1px solid #ced4da;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: #ffffff;
-                color: #343a40;
-                font-weight: bold;
-            }
-        """)
-        blur_type_layout.addWidget(blur_type_label)
-        blur_type_layout.addWidget(self.blur_type_combo)
-        self.param_layout.addWidget(self.blur_type_widget)
-        
-        # Edge Detection Type ComboBox
-        self.edge_type_widget = QWidget()
-        edge_type_layout = QHBoxLayout(self.edge_type_widget)
-        edge_type_label = QLabel("Edge Type:")
-        edge_type_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.edge_type_combo = QComboBox()
-        self.edge_type_combo.addItems(["Canny", "Sobel", "Laplacian"])
-        self.edge_type_combo.setStyleSheet("""
-            QComboBox {
-                border: 1px solid #ced4da;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: #ffffff;
-                color: #343a40;
-                font-weight: bold;
-            }
-        """)
-        edge_type_layout.addWidget(edge_type_label)
-        edge_type_layout.addWidget(self.edge_type_combo)
-        self.param_layout.addWidget(self.edge_type_widget)
-        
-        # Kernel Size Parameter
-        self.kernel_widget = QWidget()
-        kernel_layout = QHBoxLayout(self.kernel_widget)
-        kernel_label = QLabel("Kernel Size:")
-        kernel_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.kernel_slider = QSlider(Qt.Horizontal)
-        self.kernel_slider.setRange(1, 31)
-        self.kernel_slider.setValue(3)
-        self.kernel_value = QLabel("3")
-        self.kernel_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.kernel_slider.valueChanged.connect(lambda v: self.kernel_value.setText(str(v)))
-        kernel_layout.addWidget(kernel_label)
-        kernel_layout.addWidget(self.kernel_slider)
-        kernel_layout.addWidget(self.kernel_value)
-        self.param_layout.addWidget(self.kernel_widget)
-        
-        # Bilateral Filter Parameters
-        self.bilateral_widget = QWidget()
-        bilateral_layout = QHBoxLayout(self.bilateral_widget)
-        bilateral_label = QLabel("Diameter:")
-        bilateral_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.bilateral_slider = QSlider(Qt.Horizontal)
-        self.bilateral_slider.setRange(5, 50)
-        self.bilateral_slider.setValue(9)
-        self.bilateral_value = QLabel("9")
-        self.bilateral_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.bilateral_slider.valueChanged.connect(lambda v: self.bilateral_value.setText(str(v)))
-        bilateral_layout.addWidget(bilateral_label)
-        bilateral_layout.addWidget(self.bilateral_slider)
-        bilateral_layout.addWidget(self.bilateral_value)
-        self.param_layout.addWidget(self.bilateral_widget)
-        
-        # Sigma Parameters untuk Bilateral
-        self.sigma_widget = QWidget()
-        sigma_layout = QHBoxLayout(self.sigma_widget)
-        sigma_label = QLabel("Sigma:")
-        sigma_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.sigma_slider = QSlider(Qt.Horizontal)
-        self.sigma_slider.setRange(10, 200)
-        self.sigma_slider.setValue(75)
-        self.sigma_value = QLabel("75")
-        self.sigma_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.sigma_slider.valueChanged.connect(lambda v: self.sigma_value.setText(str(v)))
-        sigma_layout.addWidget(sigma_label)
-        sigma_layout.addWidget(self.sigma_slider)
-        sigma_layout.addWidget(self.sigma_value)
-        self.param_layout.addWidget(self.sigma_widget)
-        
-        # Canny Parameters
-        self.canny_widget = QWidget()
-        canny_layout = QVBoxLayout(self.canny_widget)
-        
-        # Threshold 1
-        canny_thresh1_widget = QWidget()
-        canny_thresh1_layout = QHBoxLayout(canny_thresh1_widget)
-        canny_thresh1_label = QLabel("Threshold 1:")
-        canny_thresh1_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.canny_thresh1_slider = QSlider(Qt.Horizontal)
-        self.canny_thresh1_slider.setRange(10, 300)
-        self.canny_thresh1_slider.setValue(100)
-        self.canny_thresh1_value = QLabel("100")
-        self.canny_thresh1_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.canny_thresh1_slider.valueChanged.connect(lambda v: self.canny_thresh1_value.setText(str(v)))
-        canny_thresh1_layout.addWidget(canny_thresh1_label)
-        canny_thresh1_layout.addWidget(self.canny_thresh1_slider)
-        canny_thresh1_layout.addWidget(self.canny_thresh1_value)
-        canny_layout.addWidget(canny_thresh1_widget)
-        
-        # Threshold 2
-        canny_thresh2_widget = QWidget()
-        canny_thresh2_layout = QHBoxLayout(canny_thresh2_widget)
-        canny_thresh2_label = QLabel("Threshold 2:")
-        canny_thresh2_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.canny_thresh2_slider = QSlider(Qt.Horizontal)
-        self.canny_thresh2_slider.setRange(10, 300)
-        self.canny_thresh2_slider.setValue(200)
-        self.canny_thresh2_value = QLabel("200")
-        self.canny_thresh2_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.canny_thresh2_slider.valueChanged.connect(lambda v: self.canny_thresh2_value.setText(str(v)))
-        canny_thresh2_layout.addWidget(canny_thresh2_label)
-        canny_thresh2_layout.addWidget(self.canny_thresh2_slider)
-        canny_thresh2_layout.addWidget(self.canny_thresh2_value)
-        canny_layout.addWidget(canny_thresh2_widget)
-        
-        self.param_layout.addWidget(self.canny_widget)
-        
-        # Sobel Parameters
-        self.sobel_widget = QWidget()
-        sobel_layout = QHBoxLayout(self.sobel_widget)
-        sobel_label = QLabel("Kernel Size:")
-        sobel_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.sobel_slider = QSlider(Qt.Horizontal)
-        self.sobel_slider.setRange(1, 7)
-        self.sobel_slider.setValue(3)
-        self.sobel_value = QLabel("3")
-        self.sobel_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.sobel_slider.valueChanged.connect(lambda v: self.sobel_value.setText(str(v)))
-        sobel_layout.addWidget(sobel_label)
-        sobel_layout.addWidget(self.sobel_slider)
-        sobel_layout.addWidget(self.sobel_value)
-        self.param_layout.addWidget(self.sobel_widget)
-        
-        # Threshold Parameter
-        self.thresh_widget = QWidget()
-        thresh_layout = QHBoxLayout(self.thresh_widget)
-        thresh_label = QLabel("Threshold:")
-        thresh_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.spin_thresh = QSpinBox()
-        self.spin_thresh.setRange(0, 255)
-        self.spin_thresh.setValue(127)
-        self.spin_thresh.setStyleSheet("""
-            QSpinBox {
-                border: 1px solid #ced4da;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: #ffffff;
-                color: #343a40;
-                font-weight: bold;
-            }
-        """)
-        thresh_layout.addWidget(thresh_label)
-        thresh_layout.addWidget(self.spin_thresh)
-        self.param_layout.addWidget(self.thresh_widget)
-        
-        # Brightness/Contrast Parameters
-        self.brightness_widget = QWidget()
-        brightness_layout = QHBoxLayout(self.brightness_widget)
-        bright_label = QLabel("Brightness:")
-        bright_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.spin_brightness = QDoubleSpinBox()
-        self.spin_brightness.setRange(-100, 100)
-        self.spin_brightness.setValue(0)
-        self.spin_brightness.setSingleStep(5)
-        self.spin_brightness.setStyleSheet("""
-            QDoubleSpinBox {
-                border: 1px solid #ced4da;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: #ffffff;
-                color: #343a40;
-                font-weight: bold;
-            }
-        """)
-        brightness_layout.addWidget(bright_label)
-        brightness_layout.addWidget(self.spin_brightness)
-        self.param_layout.addWidget(self.brightness_widget)
-        
-        self.contrast_widget = QWidget()
-        contrast_layout = QHBoxLayout(self.contrast_widget)
-        contrast_label = QLabel("Contrast:")
-        contrast_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.spin_contrast = QDoubleSpinBox()
-        self.spin_contrast.setRange(0.5, 3.0)
-        self.spin_contrast.setValue(1.0)
-        self.spin_contrast.setSingleStep(0.1)
-        self.spin_contrast.setStyleSheet(self.spin_brightness.styleSheet())
-        contrast_layout.addWidget(contrast_label)
-        contrast_layout.addWidget(self.spin_contrast)
-        self.param_layout.addWidget(self.contrast_widget)
-        
-        # Sharpen Parameter
-        self.sharpen_widget = QWidget()
-        sharpen_layout = QHBoxLayout(self.sharpen_widget)
-        sharpen_label = QLabel("Sharpness Factor:")
-        sharpen_label.setStyleSheet("color: #343a40; font-weight: bold;")
-        self.sharpen_slider = QSlider(Qt.Horizontal)
-        self.sharpen_slider.setRange(50, 300)
-        self.sharpen_slider.setValue(100)
-        self.sharpen_value = QLabel("100")
-        self.sharpen_value.setStyleSheet("font-weight: bold; color: #343a40;")
-        self.sharpen_slider.valueChanged.connect(lambda v: self.sharpen_value.setText(str(v)))
-        sharpen_layout.addWidget(sharpen_label)
-        sharpen_layout.addWidget(self.sharpen_slider)
-        sharpen_layout.addWidget(self.sharpen_value)
-        self.param_layout.addWidget(self.sharpen_widget)
-
+        # Panel parameter dibangkitkan dari deklarasi operasi di registry
+        self.param_panel = ParamPanel()
+        self.param_panel.loaded.connect(lambda name, choice, path: self.session.note_file(choice, path))
+        self.method_list.setCurrentRow(0)
+        
         # Tambahkan container parameter ke layout utama
-        method_layout.addWidget(self.param_container)
+        method_layout.addWidget(self.param_panel)
+        
+        # Mode kualitas: Draft = aproksimasi cepat (bilateral, median besar), Final = exact
+        quality_row = QHBoxLayout()
+        quality_label = QLabel("Quality:")
+        quality_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.quality_combo = QComboBox()
+        self.quality_combo.addItems([mode.title() for mode in QUALITY_MODES])
+        self.quality_combo.setStyleSheet(COMBO_STYLE)
+        quality_row.addWidget(quality_label)
+        quality_row.addWidget(self.quality_combo)
+        method_layout.addLayout(quality_row)
         
         # Apply Button
         apply_btn = QPushButton("🚀 Apply Processing")
@@ -569,11 +385,11 @@ class MainWindow(QMainWindow):
         orig_layout.addWidget(orig_label)
         
         orig_content = QHBoxLayout()
-        self.lbl_orig = QLabel("No image loaded")
-        self.lbl_orig.setAlignment(Qt.AlignCenter)
-        self.lbl_orig.setFixedSize(400, 300)
-        self.lbl_orig.setStyleSheet("""
-            QLabel {
+        # Viewer zoom/pan berbasis pyramid (wheel = zoom, drag = pan, double-click = fit)
+        self.view_orig = PyramidViewer("No image loaded")
+        self.view_orig.setFixedSize(400, 300)
+        self.view_orig.setStyleSheet("""
+            PyramidViewer {
                 border: 2px dashed #ced4da;
                 border-radius: 8px;
                 background-color: #f8f9fa;
@@ -586,7 +402,7 @@ class MainWindow(QMainWindow):
         self.orig_hist_canvas = HistogramCanvas(self, width=4, height=2)
         self.orig_hist_canvas.setFixedSize(400, 200)
         
-        orig_content.addWidget(self.lbl_orig)
+        orig_content.addWidget(self.view_orig)
         orig_content.addWidget(self.orig_hist_canvas)
         orig_layout.addLayout(orig_content)
         
@@ -604,19 +420,71 @@ class MainWindow(QMainWindow):
         result_label.setStyleSheet(orig_label.styleSheet())
         result_layout.addWidget(result_label)
         
+        # Compare controls (before/after: split, blink, difference)
+        compare_bar = QHBoxLayout()
+        compare_label = QLabel("View:")
+        compare_label.setStyleSheet("color: #343a40; font-weight: bold;")
+        self.compare_combo = QComboBox()
+        self.compare_combo.addItems(["Result"] + COMPARE_MODES)
+        self.compare_combo.setStyleSheet(COMBO_STYLE)
+        self.split_slider = QSlider(Qt.Horizontal)
+        self.split_slider.setRange(0, 100)
+        self.split_slider.setValue(50)
+        self.split_slider.setFixedWidth(150)
+        compare_bar.addWidget(compare_label)
+        compare_bar.addWidget(self.compare_combo)
+        compare_bar.addWidget(self.split_slider)
+        compare_bar.addStretch()
+        result_layout.addLayout(compare_bar)
+        
         result_content = QHBoxLayout()
-        self.lbl_result = QLabel("Processing result will appear here")
-        self.lbl_result.setAlignment(Qt.AlignCenter)
-        self.lbl_result.setFixedSize(400, 300)
-        self.lbl_result.setStyleSheet(self.lbl_orig.styleSheet())
+        self.view_result = PyramidViewer("Processing result will appear here")
+        self.view_result.setFixedSize(400, 300)
+        self.view_result.setStyleSheet(self.view_orig.styleSheet())
+        self.view_compare = CompareViewer("Processing result will appear here")
+        self.view_compare.setFixedSize(400, 300)
+        self.view_compare.setStyleSheet(self.view_orig.styleSheet().replace("PyramidViewer", "CompareViewer"))
+        self.view_orig.link(self.view_result)
+        self.view_orig.link(self.view_compare)
+        self.view_result.link(self.view_compare)
+        
+        self.result_stack = QStackedWidget()
+        self.result_stack.setFixedSize(400, 300)
+        self.result_stack.addWidget(self.view_result)
+        self.result_stack.addWidget(self.view_compare)
         
         self.result_hist_canvas = HistogramCanvas(self, width=4, height=2)
         self.result_hist_canvas.setFixedSize(400, 200)
         
-        result_content.addWidget(self.lbl_result)
+        result_content.addWidget(self.result_stack)
         result_content.addWidget(self.result_hist_canvas)
         result_layout.addLayout(result_content)
         
+        # Statistik perbedaan (preview dulu, lalu full resolution di background)
+        self.diff_label = QLabel("")
+        self.diff_label.setStyleSheet("color: #495057; font-size: 11px; font-weight: bold;")
+        result_layout.addWidget(self.diff_label)
+        self.diff_job = DifferenceStatsJob(self)
+        self.diff_job.updated.connect(lambda stats, full: self.diff_label.setText(format_stats(stats, full)))
+        
+        # Waktu proses; untuk draft juga speedup & error terhadap hasil exact (diukur di background)
+        self.quality_label = QLabel("")
+        self.quality_label.setStyleSheet(self.diff_label.styleSheet())
+        result_layout.addWidget(self.quality_label)
+        self.quality_job = QualityReportJob(self)
+        self.quality_job.reported.connect(lambda report: self.quality_label.setText(format_report(report)))
+        
+        # Antrian scheduler: jumlah job menunggu, RAM terpakai dan rata-rata waktu tunggu
+        self.queue_label = QLabel("")
+        self.queue_label.setStyleSheet("color: #6c757d; font-size: 10px;")
+        result_layout.addWidget(self.queue_label)
+        self.queue_timer = QTimer(self)
+        self.queue_timer.timeout.connect(lambda: self.queue_label.setText(format_queue(self.scheduler.stats())))
+        self.queue_timer.start(500)
+        
+        self.compare_combo.currentTextChanged.connect(self.compare_mode_changed)
+        self.split_slider.valueChanged.connect(lambda v: self.view_compare.set_split(v / 100.0))
+        
         result_section.setLayout(result_layout)
         right_layout.addWidget(result_section)
         
@@ -631,10 +499,7 @@ class MainWindow(QMainWindow):
 
         # Initial control visibility
         self.method_changed()
-        
-        # Connect combo boxes to update parameters
-        self.blur_type_combo.currentTextChanged.connect(self.update_blur_parameters)
-        self.edge_type_combo.currentTextChanged.connect(self.update_edge_parameters)
+        self.compare_mode_changed()
 
     def load_image(self):
         path, _ = QFileDialog.getOpenFileName(self, "Open image", "", "Images (*.png *.jpg *.bmp)")
@@ -644,7 +509,10 @@ class MainWindow(QMainWindow):
         if img is None:
             return
         self.orig = img
-        self.result = img.copy()
+        del img
+        self.image_path = path
+        self._apply_generation += 1
+        self.store.alias("result", "orig")
         self.update_previews()
 
     def save_result(self):
@@ -657,288 +525,236 @@ class MainWindow(QMainWindow):
         _, buf = cv2.imencode(f'.{ext}', self.result)
         buf.tofile(path)
 
+    def load_dataset_histogram(self):
+        """Show an aggregate histogram written by dataset_stats.py --aggregate"""
+        path, _ = QFileDialog.getOpenFileName(self, "Open dataset aggregate", "", "Aggregate (*.npz)")
+        if not path:
+            return
+        try:
+            acc = StatsAccumulator.load(path)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error loading aggregate {path}: {e}")
+            return
+        self.result_hist_canvas.plot_counts(acc.hist_bgr, f"Dataset Histogram ({acc.images} images)")
+
+    def save_session(self):
+        """Write the recorded operations to a manifest for `cli.py replay`"""
+        path, _ = QFileDialog.getSaveFileName(self, "Save session", "session.json", "Session (*.json)")
+        if not path:
+            return
+        try:
+            self.session.save(path)
+        except OSError as e:
+            print(f"Error saving session {path}: {e}")
+
+    def load_session(self):
+        """Re-apply a saved session's pipeline to the current image"""
+        path, _ = QFileDialog.getOpenFileName(self, "Open session", "", "Session (*.json)")
+        if not path:
+            return
+        try:
+            manifest = load_manifest(path)
+            steps = prepare_pipeline(manifest["pipeline"])
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error loading session {path}: {e}")
+            return
+        if not steps:
+            return
+        # Kontrol menampilkan langkah terakhir; file kernel custom sudah di-load ke registry
+        for step, (_, params) in zip(manifest["pipeline"], steps):
+            for name, file in step.get("files", {}).items():
+                self.session.note_file(params[name], file)
+        op, params = steps[-1]
+        self.method_list.setCurrentRow(OPERATIONS.names().index(op.name))
+        self.param_panel.set_values(params)
+        if self.orig is None:
+            return
+        if len(steps) == 1:
+            self.apply_method()
+            return
+
+        def finish(outcome):
+            if isinstance(outcome, BaseException):
+                print(f"Error replaying session {path}: {outcome}")
+                return
+            self.result = outcome
+            self.session.pipeline = manifest["pipeline"]
+            self.update_previews()
+
+        img = self.image("orig")
+        self._schedule(lambda: run_pipeline(img, steps), estimate_pipeline_memory(steps, img.shape), finish)
+
     def reset(self):
         if self.orig is None:
             return
-        self.result = self.orig.copy()
+        self._apply_generation += 1
+        self.store.alias("result", "orig")
+        self.session.reset()
         self.update_previews()
 
     def update_previews(self):
         # Original image preview and histogram
+        self.view_orig.set_image(self.orig)
         if self.orig is not None:
-            qimg_o = qimg_from_cv(self.orig)
-            pix_o = QPixmap.fromImage(qimg_o).scaled(
-                self.lbl_orig.width(), self.lbl_orig.height(), 
-                Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            self.lbl_orig.setPixmap(pix_o)
-            self.orig_hist_canvas.plot_hist(self.orig)
+            self.orig_hist_canvas.plot_hist(self.image("orig"))
         else:
-            self.lbl_orig.clear()
-            self.lbl_orig.setText("No image loaded")
             self.orig_hist_canvas.plot_hist(None)
 
-        # Result image preview and histogram
+        # Result image preview and histogram (zoom/pan dipertahankan)
+        self.view_result.set_image(self.result, keep_view=True)
         if self.result is not None:
-            qimg_r = qimg_from_cv(self.result)
-            pix_r = QPixmap.fromImage(qimg_r).scaled(
-                self.lbl_result.width(), self.lbl_result.height(), 
-                Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            self.lbl_result.setPixmap(pix_r)
-            self.result_hist_canvas.plot_hist(self.result)
+            self.result_hist_canvas.plot_hist(self.image("result"))
         else:
-            self.lbl_result.clear()
-            self.lbl_result.setText("Processing result will appear here")
             self.result_hist_canvas.plot_hist(None)
 
-    def update_blur_parameters(self):
-        """Update parameter visibility based on selected blur type"""
-        blur_type = self.blur_type_combo.currentText()
-        
-        # Hide all blur parameters first
-        self.kernel_widget.setVisible(False)
-        self.bilateral_widget.setVisible(False)
-        self.sigma_widget.setVisible(False)
-        
-        # Show relevant parameters based on blur type
-        if blur_type == "Gaussian Blur":
-            self.kernel_widget.setVisible(True)
-            self.kernel_slider.setRange(1, 31)
-            self.kernel_slider.setValue(3)
-            self.kernel_value.setText("3")
-        elif blur_type == "Median Blur":
-            self.kernel_widget.setVisible(True)
-            self.kernel_slider.setRange(1, 31)
-            self.kernel_slider.setValue(3)
-            self.kernel_value.setText("3")
-        elif blur_type == "Mean Blur":
-            self.kernel_widget.setVisible(True)
-            self.kernel_slider.setRange(1, 31)
-            self.kernel_slider.setValue(3)
-            self.kernel_value.setText("3")
-        elif blur_type == "Bilateral Filter":
-            self.bilateral_widget.setVisible(True)
-            self.sigma_widget.setVisible(True)
-            self.bilateral_slider.setRange(5, 50)
-            self.bilateral_slider.setValue(9)
-            self.bilateral_value.setText("9")
-            self.sigma_slider.setRange(10, 200)
-            self.sigma_slider.setValue(75)
-            self.sigma_value.setText("75")
-
-    def update_edge_parameters(self):
-        """Update parameter visibility based on selected edge detection type"""
-        edge_type = self.edge_type_combo.currentText()
-        
-        # Hide all edge detection parameters first
-        self.canny_widget.setVisible(False)
-        self.sobel_widget.setVisible(False)
-        
-        # Show relevant parameters based on edge type
-        if edge_type == "Canny":
-            self.canny_widget.setVisible(True)
-            self.canny_thresh1_slider.setRange(10, 300)
-            self.canny_thresh1_slider.setValue(100)
-            self.canny_thresh1_value.setText("100")
-            self.canny_thresh2_slider.setRange(10, 300)
-            self.canny_thresh2_slider.setValue(200)
-            self.canny_thresh2_value.setText("200")
-        elif edge_type == "Sobel":
-            self.sobel_widget.setVisible(True)
-            self.sobel_slider.setRange(1, 7)
-            self.sobel_slider.setValue(3)
-            self.sobel_value.setText("3")
-        elif edge_type == "Laplacian":
-            # Laplacian tidak memerlukan parameter tambahan
-            pass
+        self.update_compare()
+        self.mem_label.setText(self.store.describe())
+
+    def compare_mode_changed(self):
+        """Switch between the plain result view and the before/after views"""
+        mode = self.compare_combo.currentText()
+        self.split_slider.setVisible(mode == "Split")
+        if mode == "Result":
+            self.result_stack.setCurrentWidget(self.view_result)
+            self.view_compare.set_mode("Split")
+            self.diff_job.cancel()
+            self.diff_label.setText("")
+            return
+        self.view_compare.set_mode(mode)
+        self.result_stack.setCurrentWidget(self.view_compare)
+        self.update_compare()
+
+    def update_compare(self):
+        if self.compare_combo.currentText() == "Result":
+            return
+        if self.orig is None or self.result is None:
+            self.view_compare.set_images(None, None)
+            self.diff_job.cancel()
+            self.diff_label.setText("")
+            return
+        # ColorImage: plane gray yang sudah di-cache dipakai untuk SSIM dan mode Difference
+        orig, result = self.image("orig"), self.image("result")
+        self.view_compare.set_images(orig, result)
+        proxy_a, proxy_b = self.view_compare.proxies()
+        self.diff_job.request(orig, result, proxy_a, proxy_b)
+
+    def image(self, key):
+        """ColorImage over the stored array `key`, or None.
+
+        A new array (new image version) gets a new ColorImage; aliases such as
+        result == orig after a reset share one, and so share its conversions.
+        """
+        arr = self.store.get(key)
+        if arr is None:
+            self._drop_image(key)
+            return None
+        img = self._images.get(key)
+        if img is None or img.data is not arr:
+            self._drop_image(key)
+            img = next((i for i in self._images.values() if i.data is arr), None)
+            if img is None:
+                img = ColorImage(arr, store=self.store, key=key)
+            self._images[key] = img
+        return img
+
+    def _drop_image(self, key):
+        img = self._images.pop(key, None)
+        if img is not None and all(other is not img for other in self._images.values()):
+            img.release()
+
+    def current_method(self):
+        return self.method_list.currentItem().text() if self.method_list.currentItem() else ""
 
     def method_changed(self):
-        method = self.method_list.currentItem().text() if self.method_list.currentItem() else ""
-        
-        # Update deskripsi
-        self.desc_label.setText(METHOD_DESCRIPTIONS.get(method, ""))
-        
-        # Sembunyikan semua parameter terlebih dahulu
-        self.blur_type_widget.setVisible(False)
-        self.edge_type_widget.setVisible(False)
-        self.kernel_widget.setVisible(False)
-        self.thresh_widget.setVisible(False)
-        self.canny_widget.setVisible(False)
-        self.sobel_widget.setVisible(False)
-        self.bilateral_widget.setVisible(False)
-        self.sigma_widget.setVisible(False)
-        self.brightness_widget.setVisible(False)
-        self.contrast_widget.setVisible(False)
-        self.sharpen_widget.setVisible(False)
-        
-        # Tampilkan hanya parameter yang relevan
-        if method == "Blurring/Smoothing":
-            self.blur_type_widget.setVisible(True)
-            self.update_blur_parameters()
-            
-        elif method == "Edge Detection":
-            self.edge_type_widget.setVisible(True)
-            self.update_edge_parameters()
-            
-        elif method == "Threshold (Binary)":
-            self.thresh_widget.setVisible(True)
-            self.spin_thresh.setValue(127)
-            
-        elif method == "Brightness/Contrast Adjustment":
-            self.brightness_widget.setVisible(True)
-            self.contrast_widget.setVisible(True)
-            self.spin_brightness.setValue(0)
-            self.spin_contrast.setValue(1.0)
-            
-        elif method == "Sharpen / Contrast":
-            self.sharpen_widget.setVisible(True)
-            self.sharpen_slider.setRange(50, 300)
-            self.sharpen_slider.setValue(100)
-            self.sharpen_value.setText("100")
-        
-        # Untuk metode tanpa parameter (Image Negative, Grayscale, Histogram Equalization, 
-        # Morphology operations) - tidak menampilkan parameter apapun
+        op = OPERATIONS.get(self.current_method())
+        
+        # Update deskripsi dan bangun ulang kontrol parameter (nilai default)
+        self.desc_label.setText(op.description if op else "")
+        self.param_panel.set_operation(op)
+
+    def current_params(self):
+        """Values of the current method's parameter controls"""
+        return self.param_panel.values()
 
     def apply_method(self):
         if self.orig is None:
             return
-        method = self.method_list.currentItem().text() if self.method_list.currentItem() else ""
-        img = self.orig.copy()
-        
-        try:
-            if method == "Image Negative":
-                inverted = cv2.bitwise_not(img)
-                self.result = inverted
-                
-            elif method == "Grayscale":
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                self.result = gray
-            
-            elif method == "Histogram Equalization":
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                eq = cv2.equalizeHist(gray)
-                self.result = eq
-            
-            elif method == "Threshold (Binary)":
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                t = int(self.spin_thresh.value())
-                _, th = cv2.threshold(gray, t, 255, cv2.THRESH_BINARY)
-                self.result = th
-            
-            elif method == "Blurring/Smoothing":
-                blur_type = self.blur_type_combo.currentText()
-                
-                if blur_type == "Gaussian Blur":
-                    k = int(self.kernel_slider.value())
-                    if k % 2 == 0:  # Kernel harus ganjil
-                        k += 1
-                    if k < 1: k = 1
-                    blur = cv2.GaussianBlur(img, (k, k), 0)
-                    self.result = blur
-                    
-                elif blur_type == "Median Blur":
-                    k = int(self.kernel_slider.value())
-                    if k % 2 == 0:  # Kernel harus ganjil
-                        k += 1
-                    if k < 1: k = 1
-                    med = cv2.medianBlur(img, k)
-                    self.result = med
-                    
-                elif blur_type == "Mean Blur":
-                    k = int(self.kernel_slider.value())
-                    if k < 1: k = 1
-                    # Mean blur menggunakan box filter
-                    blur = cv2.blur(img, (k, k))
-                    self.result = blur
-                    
-                elif blur_type == "Bilateral Filter":
-                    d = int(self.bilateral_slider.value())
-                    sigma = int(self.sigma_slider.value())
-                    bilateral = cv2.bilateralFilter(img, d, sigma, sigma)
-                    self.result = bilateral
-            
-            elif method == "Edge Detection":
-                edge_type = self.edge_type_combo.currentText()
-                
-                if edge_type == "Canny":
-                    threshold1 = int(self.canny_thresh1_slider.value())
-                    threshold2 = int(self.canny_thresh2_slider.value())
-                    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                    edges = cv2.Canny(gray, threshold1, threshold2)
-                    self.result = edges
-                    
-                elif edge_type == "Sobel":
-                    k = int(self.sobel_slider.value())
-                    if k % 2 == 0:  # Kernel harus ganjil
-                        k += 1
-                    if k < 1: k = 1
-                    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=k)
-                    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=k)
-                    sobel = np.sqrt(sobelx**2 + sobely**2)
-                    sobel = np.uint8(255 * sobel / np.max(sobel)) if np.max(sobel) > 0 else np.zeros_like(sobelx, dtype=np.uint8)
-                    self.result = sobel
-                    
-                elif edge_type == "Laplacian":
-                    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-                    laplacian = np.uint8(np.absolute(laplacian))
-                    self.result = laplacian
-            
-            elif method == "Morphology (Open)":
-                # Default kernel size 3x3 untuk morphology
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                _, th = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-                opened = cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel)
-                self.result = opened
-            
-            elif method == "Morphology (Close)":
-                # Default kernel size 3x3 untuk morphology
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                _, th = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-                closed = cv2.morphologyEx(th, cv2.MORPH_CLOSE, kernel)
-                self.result = closed
-            
-            elif method == "Dilation":
-                # Default kernel size 3x3 untuk dilation
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                _, th = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-                dilated = cv2.dilate(th, kernel, iterations=1)
-                self.result = dilated
-            
-            elif method == "Erosion":
-                # Default kernel size 3x3 untuk erosion
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                _, th = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-                eroded = cv2.erode(th, kernel, iterations=1)
-                self.result = eroded
-            
-            elif method == "Brightness/Contrast Adjustment":
-                brightness = float(self.spin_brightness.value())
-                contrast = float(self.spin_contrast.value())
-                adjusted = cv2.convertScaleAbs(img, alpha=contrast, beta=brightness)
-                self.result = adjusted
-            
-            elif method == "Sharpen / Contrast":
-                kernel = np.array([[0,-1,0], [-1,5,-1], [0,-1,0]])
-                sharp = cv2.filter2D(img, -1, kernel)
-                out = cv2.convertScaleAbs(sharp, alpha=1, beta=0)
-                self.result = out
-            
-            else:
-                self.result = img
+        method = self.current_method()
+        params = self.current_params()
+        op = OPERATIONS.get(method)
+        quality = self.quality_combo.currentText().lower()
+        # Histogram gambar asli dipakai ulang antar apply
+        # (dihitung hanya bila operasi memintanya)
+        feedback = {}
+        img = self.image("orig")
 
+        def run():
+            # View read-only, bukan copy: semua operasi menghasilkan array baru
+            result, elapsed = timed(op.run, img, params, feedback=feedback, quality=quality)
+            return result, elapsed, feedback
+
+        def finish(outcome):
+            if isinstance(outcome, BaseException):
+                print(f"Error applying method {method}: {outcome}")
+                return
+            self.result, elapsed, feedback = outcome
+            # Nilai hasil hitungan (mis. threshold Otsu) ditampilkan di kontrolnya
+            self.param_panel.set_values(feedback)
+            self.session.record(method, params, self.image_path, feedback, quality)
+            self.report_quality(op, params, quality, elapsed)
             self.update_previews()
-            
+
+        try:
+            memory = estimate_memory(op, img.shape, params, quality)
         except Exception as e:
             print(f"Error applying method {method}: {e}")
+            return
+        self._schedule(run, memory, finish)
+
+    def _schedule(self, run, memory, finish):
+        """Run run() as an interactive job; finish(result or exception) runs on the GUI thread.
+
+        Only the newest job is finished: a later apply, load, reset or close
+        makes the results of earlier ones stale.
+        """
+        self._apply_generation += 1
+        generation = self._apply_generation
+        self._pending_apply = finish
+        try:
+            future = self.scheduler.submit(run, priority=INTERACTIVE, memory=memory)
+        except RuntimeError as e:  # scheduler sudah di-shutdown (window ditutup)
+            print(f"Error scheduling job: {e}")
+            return
+        future.add_done_callback(
+            lambda f: f.cancelled() or self.applied.emit(generation, f.exception() or f.result()))
+
+    def _on_applied(self, generation, outcome):
+        if generation == self._apply_generation:
+            self._pending_apply(outcome)
+
+    def report_quality(self, op, params, quality, elapsed):
+        """Show the apply time; for a real draft, start measuring it against the exact result"""
+        if quality == DRAFT and op.hints(params)["draft"]:
+            self.quality_label.setText(f"Draft {elapsed * 1000:.0f} ms | measuring final...")
+            sample = sample_crop(self.orig).shape
+            self.quality_job.request(lambda img, q: op.run(img, params, quality=q), self.orig,
+                                     estimate_memory(op, sample, params, DRAFT, include_input=True))
+        else:
+            self.quality_job.cancel()
+            self.quality_label.setText(f"Final {elapsed * 1000:.0f} ms")
+
+    def closeEvent(self, event):
+        self._apply_generation += 1
+        self.queue_timer.stop()
+        # Batalkan pengukuran exact yang masih antri; job yang sedang jalan dibiarkan
+        # selesai di background, hasilnya dibuang dan store tidak ditulis lagi
+        self.quality_job.cancel()
+        self.scheduler.shutdown(wait=False)
+        self.store.close()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
+    OPERATIONS.load_plugins()
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()
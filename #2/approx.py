@@ -0,0 +1,129 @@
+"""Draft (approximate) versions of the slowest filters for interactive preview.
+
+Bilateral and large median filters are run on a downsampled copy and
+brought back to full resolution by guided-filter joint upsampling (He et
+al.): a local linear model result ~= a * original + b is fitted at low
+resolution and a, b are upsampled, so edges follow the full-resolution
+original instead of the blurry small result. "final" always uses the
+exact cv2.bilateralFilter / cv2.medianBlur.
+"""
+import math
+import time
+
+import cv2
+import numpy as np
+
+QUALITY_MODES = ["final", "draft"]
+FINAL = "final"
+DRAFT = "draft"
+
+MAX_DRAFT_SCALE = 4
+GUIDED_RADIUS = 1          # radius box filter di resolusi kecil
+GUIDED_EPS = 0.01          # regularisasi (intensitas dinormalisasi ke 0..1)
+MIN_DRAFT_PIXELS = 1 << 16  # gambar kecil: versi exact sudah cepat
+QUALITY_SAMPLE_SIDE = 1024  # GUI mengukur draft vs final pada crop tengah sebesar ini
+
+
+def draft_scale(size, img):
+    """Downsampling factor for a filter of the given diameter/kernel size (1 = run exact)"""
+    if img.shape[0] * img.shape[1] < MIN_DRAFT_PIXELS:
+        return 1
+    return int(max(1, min(MAX_DRAFT_SCALE, size // 4)))
+
+
+def guided_upsample(small_result, small_guide, guide, radius=GUIDED_RADIUS, eps=GUIDED_EPS):
+    """Upsample small_result to guide's size, following guide's edges (fast guided filter)"""
+    h, w = guide.shape[:2]
+    ksize = (2 * radius + 1, 2 * radius + 1)
+    mean = lambda x: cv2.boxFilter(x, cv2.CV_32F, ksize, borderType=cv2.BORDER_REFLECT)
+    i = small_guide.astype(np.float32) / 255.0
+    p = small_result.astype(np.float32) / 255.0
+    mean_i, mean_p = mean(i), mean(p)
+    var_i = mean(i * i) - mean_i * mean_i
+    cov_ip = mean(i * p) - mean_i * mean_p
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    a = cv2.resize(mean(a), (w, h), interpolation=cv2.INTER_LINEAR)
+    b = cv2.resize(mean(b), (w, h), interpolation=cv2.INTER_LINEAR)
+    # a * guide + 255 * b, dibulatkan dan di-saturate langsung ke uint8
+    return cv2.addWeighted(cv2.multiply(a, guide, dtype=cv2.CV_32F), 1.0, b, 255.0, 0.0, dtype=cv2.CV_8U)
+
+
+def _downsampled(img, scale, fn):
+    h, w = img.shape[:2]
+    small = cv2.resize(img, (max(1, w // scale), max(1, h // scale)), interpolation=cv2.INTER_AREA)
+    return guided_upsample(fn(small), small, img)
+
+
+def bilateral(img, diameter, sigma_color, sigma_space, quality=FINAL):
+    if quality == DRAFT:
+        scale = draft_scale(diameter, img)
+        if scale > 1:
+            d = max(3, diameter // scale)
+            return _downsampled(img, scale, lambda s: cv2.bilateralFilter(s, d, sigma_color, sigma_space / scale))
+    return cv2.bilateralFilter(img, diameter, sigma_color, sigma_space)
+
+
+def median(img, ksize, quality=FINAL):
+    if quality == DRAFT:
+        scale = draft_scale(ksize, img)
+        if scale > 1:
+            k = max(3, (ksize // scale) | 1)
+            return _downsampled(img, scale, lambda s: cv2.medianBlur(s, k))
+    return cv2.medianBlur(img, ksize)
+
+
+def error_stats(approx, exact):
+    """PSNR, mean and max absolute error of a draft against the exact result"""
+    diff = cv2.absdiff(approx, exact)
+    mse = cv2.norm(approx, exact, cv2.NORM_L2SQR) / approx.size
+    return {
+        "psnr": math.inf if mse == 0 else 10 * math.log10(255.0 ** 2 / mse),
+        "mean_abs": float(diff.mean()),
+        "max_abs": int(diff.max()),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def quality_report(draft, draft_time, final, final_time):
+    """Draft/final time, speedup and error of an already computed draft/final pair"""
+    report = {"draft_time": draft_time, "final_time": final_time,
+              "speedup": final_time / max(draft_time, 1e-9)}
+    report.update(error_stats(draft, final))
+    return report
+
+
+def sample_crop(img, side=QUALITY_SAMPLE_SIDE):
+    """Centre crop (a view) of at most side x side pixels"""
+    h, w = img.shape[:2]
+    ch, cw = min(h, side), min(w, side)
+    y0, x0 = (h - ch) // 2, (w - cw) // 2
+    return img[y0:y0 + ch, x0:x0 + cw]
+
+
+def compare_quality(run, img, sample_side=None):
+    """Time run(img, quality) in both modes; returns draft/final results plus speedup and error.
+
+    With sample_side both modes run on a centre crop of that size only, so the
+    measurement costs a bounded fraction of the exact filter on a large image.
+    """
+    if sample_side is not None:
+        img = sample_crop(img, sample_side)
+    draft, draft_time = timed(run, img, DRAFT)
+    final, final_time = timed(run, img, FINAL)
+    report = quality_report(draft, draft_time, final, final_time)
+    if sample_side is not None:
+        report["sample"] = img.shape[:2]
+    return draft, final, report
+
+
+def format_report(report):
+    psnr = "∞" if math.isinf(report["psnr"]) else f"{report['psnr']:.1f}"
+    sample = f" on {report['sample'][1]}x{report['sample'][0]} crop" if "sample" in report else ""
+    return (f"Draft {report['draft_time'] * 1000:.0f} ms vs final {report['final_time'] * 1000:.0f} ms{sample} "
+            f"({report['speedup']:.1f}x) | PSNR {psnr} dB, max err {report['max_abs']}")
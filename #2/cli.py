@@ -0,0 +1,185 @@
+"""Command-line front end to the operation registry.
+
+Every parameter declared by a registered operation becomes an option
+(dashes instead of underscores); options the chosen method does not use are
+ignored, and a parameter with a loader also accepts a file path (e.g. a
+custom kernel for --sharpen-kernel).
+
+    python cli.py list
+    python cli.py process in.png out.png --method "Blurring/Smoothing" --blur-type "Median Blur" --kernel-size 5
+    python cli.py process in.png out.png --method "Blurring/Smoothing" --blur-type "Bilateral Filter" --quality draft --report
+    python cli.py replay session.json IN_DIR OUT_DIR --workers 8
+    python cli.py replay session.json IN_DIR OUT_DIR --threads --ram-budget 2048
+"""
+import argparse
+import os
+import sys
+
+import cv2
+import numpy as np
+
+from approx import FINAL, QUALITY_MODES, compare_quality, format_report
+from dataset_stats import parse_shard
+from operations import OPERATIONS
+from scheduler import JobScheduler
+from session import load_manifest, replay
+
+
+def option_name(param):
+    return "--" + param.name.replace("_", "-")
+
+
+def declared_params(registry):
+    """First declaration of every parameter name across the registry"""
+    params = {}
+    for op in registry:
+        for p in op.params:
+            params.setdefault(p.name, p)
+    return params
+
+
+def add_param_options(parser, registry):
+    group = parser.add_argument_group("operation parameters")
+    for p in declared_params(registry).values():
+        kwargs = {"dest": p.name, "default": None, "help": p.help}
+        if p.type is str:
+            kwargs["metavar"] = "{" + ",".join(p.choices) + "}" if p.choices else "TEXT"
+            if p.loader is not None:
+                kwargs["help"] += " (or a file to load)"
+        else:
+            kwargs["type"] = p.type
+            if p.minimum is not None and p.maximum is not None:
+                kwargs["help"] += f" [{p.minimum}..{p.maximum}, default {p.default}]"
+        group.add_argument(option_name(p), **kwargs)
+
+
+def collect_params(op, args, parser):
+    params = {}
+    for p in op.params:
+        value = getattr(args, p.name, None)
+        if value is None:
+            continue
+        if p.choices is not None and value not in p.choices:
+            if p.loader is not None and os.path.isfile(value):
+                value = p.loader(value)
+            else:
+                parser.error(f"{option_name(p)} must be one of: {', '.join(p.choices)}")
+        params[p.name] = value
+    return params
+
+
+def describe(op):
+    hints = op.hints()
+    flags = [hints["kind"], f"{hints['input_space']}->{hints['output_space']}"]
+    if hints["tileable"]:
+        flags.append(f"tileable (halo {hints['halo']})")
+    if hints["lut_composable"]:
+        flags.append("LUT")
+    if hints["draft"]:
+        flags.append("draft")
+    lines = [f"{op.name}: {op.description}", f"    {', '.join(flags)}"]
+    if op.variant_param:
+        for value in op.param(op.variant_param).choices:
+            v = op.hints({op.variant_param: value})
+            lines.append(f"    {value}: {v['kind']}, ->{v['output_space']}, "
+                         f"{'tileable' if v['tileable'] else 'whole image'}, halo {v['halo']}"
+                         f"{', draft' if v['draft'] else ''}")
+    for p in op.params:
+        lines.append(f"    {option_name(p)} (default {p.default})")
+    return "\n".join(lines)
+
+
+def run_replay(args, parser):
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not manifest.get("pipeline"):
+        parser.error(f"{args.manifest} has no applied operations to replay")
+    for step in manifest["pipeline"]:
+        print(f"{step['method']}: {step['params']}", file=sys.stderr)
+    ext = args.ext if not args.ext or args.ext.startswith(".") else "." + args.ext
+    scheduler = None
+    if args.threads:
+        budget = int(args.ram_budget * (1 << 20)) if args.ram_budget else None
+        scheduler = JobScheduler(workers=args.workers, ram_budget=budget, interactive_reserve=0)
+    try:
+        done, skipped, failed = replay(
+            manifest, args.input_dir, args.output_dir, args.workers, args.chunk_size, args.shard, ext,
+            args.skip_existing, quality=args.quality, scheduler=scheduler,
+            progress=lambda d, s, f: print(f"\r{d} done, {s} skipped, {len(f)} failed", end="", file=sys.stderr))
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if scheduler is not None:
+            scheduler.shutdown()
+    print(file=sys.stderr)
+    for line in failed:
+        print(f"failed: {line}", file=sys.stderr)
+    print(f"done: {done}\nskipped: {skipped}\nfailed: {len(failed)}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    OPERATIONS.load_plugins()
+    parser = argparse.ArgumentParser(description="Apply registered image operations from the command line")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="list operations, their parameters and scheduling hints")
+    process = sub.add_parser("process", help="apply one operation to an image")
+    process.add_argument("input")
+    process.add_argument("output")
+    process.add_argument("--method", required=True, choices=OPERATIONS.names(), metavar="METHOD")
+    process.add_argument("--quality", choices=QUALITY_MODES, default=FINAL,
+                         help="draft = fast approximation for ops that have one (bilateral, large median)")
+    process.add_argument("--report", action="store_true",
+                         help="also run the other quality mode and print speedup and error")
+    add_param_options(process, OPERATIONS)
+    rerun = sub.add_parser("replay", help="re-run a recorded session over every image in a folder")
+    rerun.add_argument("manifest", help="session manifest (.json) saved by the app")
+    rerun.add_argument("input_dir")
+    rerun.add_argument("output_dir")
+    rerun.add_argument("--workers", type=int, default=None)
+    rerun.add_argument("--chunk-size", type=int, default=64)
+    rerun.add_argument("--shard", type=parse_shard, help="process only shard i of n (i/n)")
+    rerun.add_argument("--ext", help="output extension, e.g. .png (default: keep the input's)")
+    rerun.add_argument("--skip-existing", action="store_true", help="skip images whose output exists (resume)")
+    rerun.add_argument("--quality", choices=QUALITY_MODES, default=FINAL)
+    rerun.add_argument("--threads", action="store_true",
+                       help="run chunks on threads through the job scheduler instead of worker processes")
+    rerun.add_argument("--ram-budget", type=float, metavar="MB",
+                       help="with --threads: RAM budget for running chunks (default: $IMGPROC_RAM_BUDGET_MB "
+                            "or half of the available RAM)")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for op in OPERATIONS:
+            print(describe(op))
+        return 0
+
+    if args.command == "replay":
+        return run_replay(args, rerun)
+
+    op = OPERATIONS.get(args.method)
+    params = collect_params(op, args, process)
+    img = cv2.imdecode(np.fromfile(args.input, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        parser.error(f"cannot read image {args.input}")
+    feedback = {}
+    if args.report:
+        draft, final, report = compare_quality(lambda i, q: op.run(i, params, feedback=feedback, quality=q), img)
+        result = final if args.quality == FINAL else draft
+        print(format_report(report))
+    else:
+        result = op.run(img, params, feedback=feedback, quality=args.quality)
+    ext = os.path.splitext(args.output)[1] or ".png"
+    ok, buf = cv2.imencode(ext, result)
+    if not ok:
+        parser.error(f"cannot encode {ext} output")
+    buf.tofile(args.output)
+    for key, value in feedback.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
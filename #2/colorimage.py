@@ -0,0 +1,170 @@
+"""Images that know their colour space and cache derived representations.
+
+A ColorImage wraps one read-only array (BGR or GRAY) and converts it to
+GRAY / RGB / HSV / YCrCb / luminance on first use only; the conversions,
+the GrayAnalysis of the gray plane and the histograms are then shared by
+processing, preview and histogram plotting. Every ColorImage is a new
+`version`: a changed picture gets a new object, so caches never go stale.
+Conversions are locked per image, so jobs running in parallel on the same
+image still convert each space only once.
+"""
+import itertools
+import threading
+
+import cv2
+import numpy as np
+
+from enhance import GrayAnalysis
+
+BGR = "BGR"
+GRAY = "GRAY"
+RGB = "RGB"
+HSV = "HSV"
+YCRCB = "YCrCb"
+LUMINANCE = "Y"  # kanal Y dari YCrCb (pembulatannya sedikit beda dari GRAY)
+
+# (dari, ke) -> kode cv2; konversi lain lewat BGR
+CONVERSIONS = {
+    (BGR, GRAY): cv2.COLOR_BGR2GRAY,
+    (BGR, RGB): cv2.COLOR_BGR2RGB,
+    (BGR, HSV): cv2.COLOR_BGR2HSV,
+    (BGR, YCRCB): cv2.COLOR_BGR2YCrCb,
+    (GRAY, BGR): cv2.COLOR_GRAY2BGR,
+    (GRAY, RGB): cv2.COLOR_GRAY2RGB,
+}
+
+_versions = itertools.count(1)
+
+
+def _readonly(arr):
+    """Read-only view of arr; the caller's own array stays writable"""
+    if arr.flags.writeable:
+        arr = arr.view()
+        arr.flags.writeable = False
+    return arr
+
+
+class ColorImage:
+    """A read-only image in a known colour space with lazily cached conversions.
+
+    store is an optional WorkingSet; derived planes are then put there as
+    "<key>_<space>" (memory-mapped when large) and dropped by release(),
+    which also detaches the image from the store.
+    """
+
+    def __init__(self, data, space=None, store=None, key=None):
+        if space is None:
+            space = GRAY if data.ndim == 2 else BGR
+        self.space = space
+        self.data = _readonly(data)
+        self.version = next(_versions)
+        self.store = store
+        self.key = key
+        self._cache = {space: self.data}
+        self._analysis = None
+        self._channel_hists = None
+        self.conversions = 0  # jumlah cvtColor yang benar-benar dijalankan
+        self._lock = threading.RLock()
+
+    @classmethod
+    def wrap(cls, img, space=None):
+        """img itself if it is already a ColorImage, else a new wrapper"""
+        if img is None or isinstance(img, cls):
+            return img
+        return cls(img, space)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def get(self, space):
+        """The image in the given colour space (converted once, then cached)"""
+        arr = self._cache.get(space)
+        if arr is not None:
+            return arr
+        with self._lock:
+            return self._convert(space)
+
+    def _convert(self, space):
+        arr = self._cache.get(space)
+        if arr is not None:
+            return arr  # sudah dikonversi oleh thread lain selagi menunggu lock
+        if space == LUMINANCE:
+            arr = np.ascontiguousarray(self.get(YCRCB)[:, :, 0])
+        elif (self.space, space) in CONVERSIONS:
+            arr = cv2.cvtColor(self.data, CONVERSIONS[(self.space, space)])
+            self.conversions += 1
+        elif (BGR, space) in CONVERSIONS:
+            arr = cv2.cvtColor(self.get(BGR), CONVERSIONS[(BGR, space)])
+            self.conversions += 1
+        else:
+            raise ValueError(f"No conversion from {self.space} to {space}")
+        if self.store is not None and self.key is not None:
+            arr = self.store.put(f"{self.key}_{space}", arr)
+        self._cache[space] = _readonly(arr)
+        return self._cache[space]
+
+    @property
+    def bgr(self):
+        return self.get(BGR)
+
+    @property
+    def gray(self):
+        return self.get(GRAY)
+
+    @property
+    def rgb(self):
+        return self.get(RGB)
+
+    @property
+    def hsv(self):
+        return self.get(HSV)
+
+    @property
+    def ycrcb(self):
+        return self.get(YCRCB)
+
+    @property
+    def luminance(self):
+        return self.get(LUMINANCE)
+
+    def cached_spaces(self):
+        return list(self._cache)
+
+    def analysis(self):
+        """GrayAnalysis (shared histogram) of the gray plane"""
+        with self._lock:
+            if self._analysis is None:
+                self._analysis = GrayAnalysis(self.gray)
+            return self._analysis
+
+    def histogram(self):
+        """256-bin histogram of the gray plane"""
+        return self.analysis().histogram()
+
+    def channel_histograms(self):
+        """3 x 256 per-channel histograms (B, G, R) or 1 x 256 for gray"""
+        with self._lock:
+            if self._channel_hists is None:
+                if self.space == GRAY:
+                    self._channel_hists = self.histogram()[None, :]
+                else:
+                    data = self.bgr
+                    self._channel_hists = np.stack([
+                        cv2.calcHist([data], [c], None, [256], [0, 256]).ravel() for c in range(3)
+                    ])
+            return self._channel_hists
+
+    def release(self):
+        """Drop the derived planes (and their working-set entries)"""
+        with self._lock:
+            for space in list(self._cache):
+                if space == self.space:
+                    continue
+                del self._cache[space]
+                if self.store is not None and self.key is not None:
+                    self.store.release(f"{self.key}_{space}")
+            # Job yang masih berjalan tidak boleh menimpa entry gambar baru dengan key yang sama
+            self.store = None
+            self._analysis = None
+            self._channel_hists = None
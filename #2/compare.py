@@ -0,0 +1,332 @@
+import math
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Qt, QRectF, Signal
+from PySide6.QtGui import QColor, QPen
+
+from approx import QUALITY_SAMPLE_SIDE, compare_quality
+from colorimage import ColorImage
+from scheduler import BATCH, get_scheduler
+from tiling import map_parallel, split_bounds, strip_count
+from viewer import ImagePyramid, PyramidViewer, TILE_SIZE
+
+COMPARE_MODES = ["Split", "Blink", "Difference"]
+
+PROXY_MAX_SIDE = 1024
+REFINE_DELAY_MS = 300  # tunggu interaksi selesai sebelum hitung full resolution
+BLINK_INTERVAL_MS = 500
+
+# Konstanta SSIM standar (Wang et al.), window Gaussian 11x11 sigma 1.5
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+SSIM_HALO = 5
+DIFF_SCRATCH_BYTES = 2  # plane gray a dan b per pixel (strip float32 kecil diabaikan)
+
+
+def match_channels(a, b):
+    """Bring a BGR/gray pair (arrays or ColorImages) to the same channel layout (gray if either is gray)
+
+    The gray plane of a ColorImage is its cached one, so comparing against
+    the original never converts it again.
+    """
+    a, b = ColorImage.wrap(a), ColorImage.wrap(b)
+    if a.shape[:2] != b.shape[:2]:
+        raise ValueError(f"Cannot compare images of size {a.shape[:2]} and {b.shape[:2]}")
+    if a.data.ndim == b.data.ndim:
+        return a.data, b.data
+    return a.gray, b.gray
+
+
+def _ssim_sum(ga, gb):
+    ga = ga.astype(np.float32)
+    gb = gb.astype(np.float32)
+    blur = lambda x: cv2.GaussianBlur(x, (11, 11), 1.5)
+    mu_a, mu_b = blur(ga), blur(gb)
+    mu_aa, mu_bb, mu_ab = mu_a * mu_a, mu_b * mu_b, mu_a * mu_b
+    var_a = blur(ga * ga) - mu_aa
+    var_b = blur(gb * gb) - mu_bb
+    cov = blur(ga * gb) - mu_ab
+    ssim = ((2 * mu_ab + SSIM_C1) * (2 * cov + SSIM_C2)) / ((mu_aa + mu_bb + SSIM_C1) * (var_a + var_b + SSIM_C2))
+    return ssim
+
+
+def difference_stats(a, b, changed_threshold=0):
+    """MSE, PSNR, SSIM (on luminance) and changed-pixel count of two same-size images.
+
+    Computed as a parallel reduction over horizontal strips, so no full-size
+    float intermediates are allocated. a and b may be ColorImages; their
+    cached gray planes are used for SSIM.
+    """
+    a, b = ColorImage.wrap(a), ColorImage.wrap(b)
+    ga, gb = a.gray, b.gray
+    a, b = match_channels(a, b)
+    h = a.shape[0]
+    channels = 1 if a.ndim == 2 else a.shape[2]
+
+    def strip(bound):
+        y0, y1 = bound
+        p0, p1 = max(0, y0 - SSIM_HALO), min(h, y1 + SSIM_HALO)
+        diff = cv2.absdiff(a[y0:y1], b[y0:y1])
+        per_pixel = diff if diff.ndim == 2 else diff.max(axis=2)
+        ssim = _ssim_sum(ga[p0:p1], gb[p0:p1])[y0 - p0:y1 - p0]
+        return (cv2.norm(diff, cv2.NORM_L2SQR), int(np.count_nonzero(per_pixel > changed_threshold)),
+                int(diff.max()) if diff.size else 0, float(ssim.sum(dtype=np.float64)))
+
+    parts = map_parallel(strip, split_bounds(h, strip_count(a)))
+    n = a.shape[0] * a.shape[1]
+    sq = sum(p[0] for p in parts)
+    mse = sq / (n * channels)
+    return {
+        "mse": mse,
+        "psnr": math.inf if mse == 0 else 10 * math.log10(255.0 ** 2 / mse),
+        "ssim": sum(p[3] for p in parts) / n,
+        "changed": sum(p[1] for p in parts),
+        "changed_fraction": sum(p[1] for p in parts) / n,
+        "max_abs": max(p[2] for p in parts),
+        "pixels": n,
+    }
+
+
+def format_stats(stats, full=True):
+    psnr = "∞" if math.isinf(stats["psnr"]) else f"{stats['psnr']:.2f}"
+    scope = "full res" if full else "preview"
+    return (f"PSNR {psnr} dB | SSIM {stats['ssim']:.4f} | "
+            f"Changed {stats['changed']:,} px ({stats['changed_fraction'] * 100:.1f}%) [{scope}]")
+
+
+class _StatsTask:
+    def __init__(self, job, generation, a, b):
+        self.job, self.generation, self.a, self.b = job, generation, a, b
+
+    def run(self):
+        try:
+            stats = difference_stats(self.a, self.b)
+        except ValueError as e:
+            print(f"Error computing difference statistics: {e}")
+            return
+        self.job.finished.emit(self.generation, stats)
+
+
+class DifferenceStatsJob(QObject):
+    """Proxy statistics immediately, full-resolution statistics in the background.
+
+    `updated(stats, full)` fires once with preview numbers and again when the
+    full-resolution refinement is done; stale refinements are dropped. The
+    refinement is a batch job on the shared scheduler.
+    """
+
+    updated = Signal(dict, bool)
+    finished = Signal(int, dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._pending = None
+        self._future = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(REFINE_DELAY_MS)
+        self._timer.timeout.connect(self._start_full)
+        self.finished.connect(self._on_finished)
+
+    def request(self, a, b, proxy_a=None, proxy_b=None):
+        """a, b: arrays or ColorImages (then their cached gray planes are reused)"""
+        self._generation += 1
+        self._drop_future()
+        a, b = ColorImage.wrap(a), ColorImage.wrap(b)
+        if proxy_a is None:
+            proxy_a = ImagePyramid(a.data).proxy(PROXY_MAX_SIDE)
+        if proxy_b is None:
+            proxy_b = ImagePyramid(b.data).proxy(PROXY_MAX_SIDE)
+        full = proxy_a.shape[:2] == a.shape[:2]
+        try:
+            self.updated.emit(difference_stats(proxy_a, proxy_b), full)
+        except ValueError as e:
+            print(f"Error computing difference statistics: {e}")
+            return
+        self._pending = None if full else (a, b)
+        self._timer.start()
+
+    def cancel(self):
+        self._generation += 1
+        self._pending = None
+        self._timer.stop()
+        self._drop_future()
+
+    def _drop_future(self):
+        if self._future is not None:
+            self._future.cancel()  # hanya berhasil bila belum mulai
+            self._future = None
+
+    def _start_full(self):
+        if self._pending is None:
+            return
+        a, b = self._pending
+        self._pending = None
+        self._drop_future()
+        task = _StatsTask(self, self._generation, a, b)
+        self._future = get_scheduler().submit(task.run, priority=BATCH, batch="diff",
+                                              memory=a.shape[0] * a.shape[1] * DIFF_SCRATCH_BYTES)
+
+    def _on_finished(self, generation, stats):
+        if generation == self._generation:
+            self.updated.emit(stats, True)
+
+
+class _QualityTask:
+    def __init__(self, job, generation, run, img):
+        self.job, self.generation, self.run_, self.img = job, generation, run, img
+
+    def run(self):
+        # Permintaan yang sudah basi tidak perlu menjalankan filter exact sama sekali
+        if self.generation != self.job._generation:
+            return
+        try:
+            _, _, report = compare_quality(self.run_, self.img, QUALITY_SAMPLE_SIDE)
+        except (ValueError, cv2.error) as e:
+            print(f"Error measuring draft quality: {e}")
+            return
+        self.job.finished.emit(self.generation, report)
+
+
+class QualityReportJob(QObject):
+    """Measures draft against exact output in the background.
+
+    `reported(report)` carries draft/final time, speedup and error (see
+    approx.compare_quality), measured on a centre crop of at most
+    QUALITY_SAMPLE_SIDE pixels square so the exact run stays cheap on large
+    images. A newer request or cancel() drops stale ones, and a job that
+    only starts after being superseded skips the work. The measurement is a
+    batch job on the shared scheduler, so it never delays the next
+    interactive apply.
+    """
+
+    reported = Signal(dict)
+    finished = Signal(int, dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._future = None
+        self.finished.connect(self._on_finished)
+
+    def request(self, run, img, memory=0):
+        """run(img, quality) -> result, measured on a crop of img"""
+        self.cancel()
+        task = _QualityTask(self, self._generation, run, img)
+        self._future = get_scheduler().submit(task.run, priority=BATCH, memory=memory, batch="quality")
+
+    def cancel(self):
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()  # hanya berhasil bila belum mulai
+            self._future = None
+
+    def _on_finished(self, generation, report):
+        if generation == self._generation:
+            self.reported.emit(report)
+
+
+class CompareViewer(PyramidViewer):
+    """Before/after viewer with split-slider, blink and absolute-difference modes.
+
+    Everything is drawn tile by tile from the two pyramids, so the comparison
+    stays as cheap as the normal viewer at any zoom level. When one side is
+    gray, the difference uses a pyramid of the other's cached gray plane.
+    """
+
+    def __init__(self, placeholder="", parent=None):
+        super().__init__(placeholder, parent)
+        self.pyramid_b = None
+        self._gray_pyramids = None  # (a, b) dengan layout kanal yang sama, untuk mode Difference
+        self.mode = "Split"
+        self.split = 0.5
+        self.diff_gain = 4.0
+        self._show_b = False
+        self._blink = QTimer(self)
+        self._blink.setInterval(BLINK_INTERVAL_MS)
+        self._blink.timeout.connect(self._toggle_blink)
+
+    def set_images(self, a, b):
+        """a, b: arrays or ColorImages (None clears the view)"""
+        a, b = ColorImage.wrap(a), ColorImage.wrap(b)
+        data_a = a.data if a is not None else None
+        data_b = b.data if b is not None else None
+        changed = self.pyramid is None or data_a is not self.pyramid.levels[0] or \
+            self.pyramid_b is None or data_b is not self.pyramid_b.levels[0]
+        if not changed:
+            return
+        self.set_image(data_a, keep_view=True)
+        self.pyramid_b = ImagePyramid(data_b) if data_b is not None else None
+        self._gray_pyramids = None
+        if a is not None and b is not None:
+            matched_a, matched_b = match_channels(a, b)
+            self._gray_pyramids = (self.pyramid if matched_a is data_a else ImagePyramid(matched_a),
+                                   self.pyramid_b if matched_b is data_b else ImagePyramid(matched_b))
+        self.tiles.clear()
+        self.update()
+
+    def proxies(self):
+        """Display proxies (matching pyramid levels and channel layout) of before and after"""
+        n = self.pyramid.proxy_level(PROXY_MAX_SIDE)
+        pyramid_a, pyramid_b = self._gray_pyramids
+        return pyramid_a.level(n), pyramid_b.level(n)
+
+    def set_mode(self, mode):
+        self.mode = mode
+        if mode == "Blink":
+            self._blink.start()
+        else:
+            self._blink.stop()
+            self._show_b = False
+        self.update()
+
+    def set_split(self, fraction):
+        self.split = min(max(fraction, 0.0), 1.0)
+        self.update()
+
+    def _toggle_blink(self):
+        self._show_b = not self._show_b
+        self.update()
+
+    def _tile_array(self, source, level, tx, ty):
+        ys = slice(ty * TILE_SIZE, (ty + 1) * TILE_SIZE)
+        xs = slice(tx * TILE_SIZE, (tx + 1) * TILE_SIZE)
+        if source is None:
+            return self.pyramid.level(level)[ys, xs]
+        tile_b = self.pyramid_b.level(level)[ys, xs]
+        if source == "b":
+            return tile_b
+        pyramid_a, pyramid_b = self._gray_pyramids
+        tile_a, tile_b = pyramid_a.level(level)[ys, xs], pyramid_b.level(level)[ys, xs]
+        return cv2.convertScaleAbs(cv2.absdiff(tile_a, tile_b), alpha=self.diff_gain)
+
+    def _draw_image(self, painter):
+        if self.pyramid_b is None:
+            self._draw_tiles(painter)
+            return
+        if self.mode == "Split":
+            x = int(self.width() * self.split)
+            self._draw_tiles(painter, None, QRectF(0, 0, x, self.height()))
+            self._draw_tiles(painter, "b", QRectF(x, 0, self.width() - x, self.height()))
+            painter.setPen(QPen(QColor("#007bff"), 2))
+            painter.drawLine(x, 0, x, self.height())
+        elif self.mode == "Blink":
+            self._draw_tiles(painter, "b" if self._show_b else None)
+        else:
+            self._draw_tiles(painter, "diff")
+
+    def _hover_text(self, x, y):
+        a = self.pyramid.levels[0][y, x].tolist()
+        if self.pyramid_b is None:
+            return f"({x}, {y}) = {a}"
+        b = self.pyramid_b.levels[0][y, x].tolist()
+        return f"({x}, {y}) before {a} → after {b}"
+
+    def mousePressEvent(self, event):
+        # Klik kanan memindahkan garis split
+        if event.button() == Qt.RightButton and self.mode == "Split":
+            self.set_split(event.position().x() / max(self.width(), 1))
+            return
+        super().mousePressEvent(event)
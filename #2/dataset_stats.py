@@ -0,0 +1,315 @@
+"""Dataset-level image statistics for quality control.
+
+Streams over a directory, computes per-image statistics (gray and BGR
+histograms, mean/std, clipping fraction, Canny edge density, mean Sobel
+magnitude) in worker processes and merges the partial results into an
+aggregate. Per-image rows go to CSV or Parquet; the aggregate is saved as
+.npz and can be shown in the app's histogram canvas.
+
+    python dataset_stats.py DIR --out stats.csv --aggregate agg.npz
+    python dataset_stats.py DIR --shard 0/4 --aggregate part0.npz
+    python dataset_stats.py --merge part0.npz part1.npz ... --aggregate agg.npz
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import cv2
+import numpy as np
+
+from operations import edge_canny, sobel_magnitude
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet opsional, CSV selalu tersedia
+    pa = pq = None
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+SCALAR_COLUMNS = [
+    "path", "width", "height", "channels", "mean", "std",
+    "clip_low", "clip_high", "clip_fraction", "edge_density", "sobel_mean",
+]
+
+
+def iter_images(root, shard=None):
+    """Yield image paths under root in a stable order, optionally one shard (i, n)"""
+    paths = _walk(root)
+    if shard is not None:
+        index, count = shard
+        paths = (p for i, p in enumerate(paths) if i % count == index)
+    return paths
+
+
+def _walk(root):
+    try:
+        entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk(entry.path)
+        elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+            yield entry.path
+
+
+def image_stats(img, canny=(100, 200), sobel_ksize=3):
+    """Per-image statistics dict; hist/hist_bgr are 256-bin int64 counts"""
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.int64)
+    if img.ndim == 2:
+        hist_bgr = np.tile(hist, (3, 1))
+    else:
+        hist_bgr = np.array([np.bincount(img[:, :, c].ravel(), minlength=256) for c in range(3)], dtype=np.int64)
+    n = gray.size
+    levels = np.arange(256, dtype=np.float64)
+    total = float(hist @ levels)
+    total_sq = float(hist @ (levels * levels))
+    mean = total / n
+    edges = edge_canny(gray, *canny)
+    sobel = sobel_magnitude(gray, sobel_ksize)
+    return {
+        "width": gray.shape[1],
+        "height": gray.shape[0],
+        "channels": 1 if img.ndim == 2 else img.shape[2],
+        "pixels": n,
+        "sum": total,
+        "sum_sq": total_sq,
+        "mean": mean,
+        "std": float(np.sqrt(max(total_sq / n - mean * mean, 0.0))),
+        "clip_low": int(hist[0]) / n,
+        "clip_high": int(hist[255]) / n,
+        "clip_fraction": int(hist[0] + hist[255]) / n,
+        "edge_count": int(np.count_nonzero(edges)),
+        "edge_density": np.count_nonzero(edges) / n,
+        "sobel_sum": float(sobel.sum()),
+        "sobel_mean": float(sobel.mean()),
+        "hist": hist,
+        "hist_bgr": hist_bgr,
+    }
+
+
+class StatsAccumulator:
+    """Mergeable aggregate of image statistics (sums only, so merge is exact)"""
+
+    FIELDS = ("images", "failed", "pixels", "sum", "sum_sq", "clip_low", "clip_high", "edge_count", "sobel_sum")
+
+    def __init__(self):
+        self.images = 0
+        self.failed = 0
+        self.pixels = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.clip_low = 0
+        self.clip_high = 0
+        self.edge_count = 0
+        self.sobel_sum = 0.0
+        self.hist = np.zeros(256, dtype=np.int64)
+        self.hist_bgr = np.zeros((3, 256), dtype=np.int64)
+
+    def add(self, stats):
+        self.images += 1
+        self.pixels += stats["pixels"]
+        self.sum += stats["sum"]
+        self.sum_sq += stats["sum_sq"]
+        self.clip_low += int(stats["hist"][0])
+        self.clip_high += int(stats["hist"][255])
+        self.edge_count += stats["edge_count"]
+        self.sobel_sum += stats["sobel_sum"]
+        self.hist += stats["hist"]
+        self.hist_bgr += stats["hist_bgr"]
+
+    def merge(self, other):
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.hist += other.hist
+        self.hist_bgr += other.hist_bgr
+        return self
+
+    def summary(self):
+        n = max(self.pixels, 1)
+        mean = self.sum / n
+        return {
+            "images": self.images,
+            "failed": self.failed,
+            "pixels": self.pixels,
+            "mean": mean,
+            "std": float(np.sqrt(max(self.sum_sq / n - mean * mean, 0.0))),
+            "clip_fraction": (self.clip_low + self.clip_high) / n,
+            "edge_density": self.edge_count / n,
+            "sobel_mean": self.sobel_sum / n,
+        }
+
+    def save(self, path):
+        np.savez(path, hist=self.hist, hist_bgr=self.hist_bgr,
+                 **{name: np.asarray(getattr(self, name)) for name in self.FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        acc = cls()
+        with np.load(path) as data:
+            for name in cls.FIELDS:
+                setattr(acc, name, data[name].item())
+            acc.hist = data["hist"].astype(np.int64)
+            acc.hist_bgr = data["hist_bgr"].astype(np.int64)
+        return acc
+
+
+def process_chunk(paths, canny=(100, 200), sobel_ksize=3):
+    """Worker entry point: per-image rows plus the chunk's partial aggregate"""
+    acc = StatsAccumulator()
+    rows = []
+    for path in paths:
+        try:
+            img = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        except (OSError, ValueError, cv2.error):
+            img = None
+        if img is None:
+            acc.failed += 1
+            continue
+        if img.ndim == 3 and img.shape[2] == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        if img.dtype != np.uint8:
+            img = cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+        stats = image_stats(img, canny, sobel_ksize)
+        acc.add(stats)
+        row = {name: stats[name] for name in SCALAR_COLUMNS if name in stats}
+        row["path"] = path
+        row["hist"] = stats["hist"]
+        rows.append(row)
+    return rows, acc
+
+
+class RowWriter:
+    """Streams per-image rows to CSV or (if pyarrow is installed) Parquet"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.lower().endswith(".parquet")
+        if self.parquet and pq is None:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow); use a .csv path instead")
+        self._writer = None
+        self._file = None
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self.parquet:
+            columns = {name: [r[name] for r in rows] for name in SCALAR_COLUMNS}
+            columns["hist"] = [r["hist"].tolist() for r in rows]
+            table = pa.table(columns)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+            return
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(SCALAR_COLUMNS + ["hist"])
+        for r in rows:
+            self._writer.writerow([r[name] for name in SCALAR_COLUMNS] + [" ".join(map(str, r["hist"]))])
+
+    def close(self):
+        if self.parquet and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def chunked(items, size):
+    """Lists of up to size consecutive items"""
+    items = iter(items)
+    return iter(lambda: list(itertools.islice(items, size)), [])
+
+
+def stream_chunks(submit, chunks, limit, collect):
+    """Submit chunks while at most limit() futures are in flight, collecting finished ones.
+
+    Shared by the statistics job and session replay: memory stays constant
+    however large the directory is.
+    """
+    pending = set()
+    for chunk in chunks:
+        pending.add(submit(chunk))
+        while len(pending) >= limit():
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(finished)
+    while pending:
+        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+        collect(finished)
+
+
+def run(root, out=None, workers=None, chunk_size=64, shard=None, canny=(100, 200), sobel_ksize=3, progress=None):
+    """Compute statistics for every image under root; returns the merged accumulator"""
+    total = StatsAccumulator()
+    writer = RowWriter(out) if out else None
+    chunks = chunked(iter_images(root, shard), chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    def collect(done):
+        for future in done:
+            rows, acc = future.result()
+            total.merge(acc)
+            if writer:
+                writer.write(rows)
+            if progress:
+                progress(total)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stream_chunks(lambda chunk: pool.submit(process_chunk, chunk, canny, sobel_ksize),
+                          chunks, lambda: 2 * workers, collect)
+    finally:
+        if writer:
+            writer.close()
+    return total
+
+
+def parse_shard(text):
+    """argparse type for "i/n": shard i of n"""
+    index, count = (int(v) for v in text.split("/"))
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("shard must be i/n with 0 <= i < n")
+    return index, count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-image and aggregate statistics for an image directory")
+    parser.add_argument("root", nargs="?", help="directory to scan recursively")
+    parser.add_argument("--out", help="per-image table (.csv or .parquet)")
+    parser.add_argument("--aggregate", help="aggregate histogram/statistics (.npz)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--shard", type=parse_shard, help="process only shard i of n (i/n)")
+    parser.add_argument("--canny", type=int, nargs=2, default=(100, 200), metavar=("T1", "T2"))
+    parser.add_argument("--sobel-ksize", type=int, default=3)
+    parser.add_argument("--merge", nargs="+", metavar="NPZ", help="merge partial aggregates instead of scanning")
+    args = parser.parse_args(argv)
+    if args.out and args.out.lower().endswith(".parquet") and pq is None:
+        parser.error("Parquet output needs pyarrow (pip install pyarrow); use a .csv path instead")
+
+    if args.merge:
+        total = StatsAccumulator()
+        for path in args.merge:
+            total.merge(StatsAccumulator.load(path))
+    elif args.root:
+        total = run(args.root, args.out, args.workers, args.chunk_size, args.shard,
+                    tuple(args.canny), args.sobel_ksize,
+                    progress=lambda acc: print(f"\r{acc.images} images", end="", file=sys.stderr))
+        print(file=sys.stderr)
+    else:
+        parser.error("give a directory to scan or --merge")
+
+    if args.aggregate:
+        total.save(args.aggregate)
+    for key, value in total.summary().items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import cv2
+import numpy as np
+
+from tiling import map_parallel, run_strips, split_bounds, strip_count
+
+MAX_BLOCK_SIZE = 101
+
+# calcHist menghitung dalam float32, yang hanya eksak sampai 2^24 per bin
+MAX_HIST_PIXELS = 1 << 24
+
+
+class GrayAnalysis:
+    """Lazily computed, shareable statistics of one grayscale image.
+
+    The global histogram is computed once (in parallel strips) and reused by
+    global equalization and Otsu thresholding.
+    """
+
+    def __init__(self, gray):
+        self.gray = gray
+        self._hist = None
+
+    def histogram(self):
+        """Global 256-bin histogram (int64, exact)"""
+        if self._hist is None:
+            h = self.gray.shape[0]
+            parts = max(strip_count(self.gray), -(-self.gray.size // MAX_HIST_PIXELS))
+            hists = map_parallel(lambda b: _hist(self.gray[b[0]:b[1]]), split_bounds(h, parts))
+            self._hist = np.sum(hists, axis=0)
+        return self._hist
+
+
+def _hist(block):
+    if block.size == 0:
+        return np.zeros(256, dtype=np.int64)
+    return cv2.calcHist([np.ascontiguousarray(block)], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+
+
+def clahe(gray, clip_limit=2.0, grid=(8, 8)):
+    """Contrast Limited Adaptive Histogram Equalization (cv2.createCLAHE) in parallel strips.
+
+    Each strip is a run of whole tile rows plus one tile row of context above
+    and below, which is all the bilinear blend between tile LUTs reads, so the
+    strips give the same result as one createCLAHE call on the whole image.
+    """
+    rows, cols = grid
+    h, w = gray.shape
+    strips = min(strip_count(gray), rows)
+    if strips <= 1:
+        return cv2.createCLAHE(clip_limit, (cols, rows)).apply(gray)
+    # Padding seperti di dalam createCLAHE, supaya strip tidak di-pad lagi sendiri
+    src = gray
+    if h % rows or w % cols:
+        src = cv2.copyMakeBorder(gray, 0, rows - h % rows, 0, cols - w % cols, cv2.BORDER_REFLECT_101)
+    tile_h = src.shape[0] // rows
+    out = np.empty_like(gray)
+
+    def work(bound):
+        t0, t1 = bound
+        c0, c1 = max(t0 - 1, 0), min(t1 + 1, rows)
+        res = cv2.createCLAHE(clip_limit, (cols, c1 - c0)).apply(src[c0 * tile_h:c1 * tile_h])
+        y0, y1 = t0 * tile_h, min(t1 * tile_h, h)
+        out[y0:y1] = res[y0 - c0 * tile_h:y1 - c0 * tile_h, :w]
+
+    map_parallel(work, split_bounds(rows, strips))
+    return out
+
+
+def equalize_gray(gray, analysis=None):
+    """Global histogram equalization computed from the shared histogram"""
+    if analysis is None or analysis.gray is not gray:
+        analysis = GrayAnalysis(gray)
+    hist = analysis.histogram()
+    cdf = hist.cumsum()
+    nz = cdf[cdf > 0]
+    cdf_min, total = nz[0], cdf[-1]
+    if total == cdf_min:
+        return gray.copy()
+    lut = np.clip(np.rint((cdf - cdf_min) * 255.0 / (total - cdf_min)), 0, 255).astype(np.uint8)
+    return run_strips(lambda s: cv2.LUT(s, lut), gray)
+
+
+def equalize_color(img, use_clahe=False, clip_limit=2.0, grid=(8, 8), ycrcb=None):
+    """Equalize only the luminance (Y of YCrCb) so colours are preserved.
+
+    ycrcb may be an already converted (even read-only) copy of img.
+    """
+    ycrcb = cv2.cvtColor(img, cv2.COLOR_BGR2YCrCb) if ycrcb is None else ycrcb.copy()
+    y = np.ascontiguousarray(ycrcb[:, :, 0])
+    ycrcb[:, :, 0] = clahe(y, clip_limit, grid) if use_clahe else equalize_gray(y)
+    return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+
+
+def otsu_threshold_value(hist):
+    """Otsu threshold from a 256-bin histogram (pixels > t become foreground)"""
+    hist = np.asarray(hist, dtype=np.float64)
+    total = hist.sum()
+    w0 = np.cumsum(hist)
+    w1 = total - w0
+    m = np.cumsum(hist * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (m[-1] * w0 - m * total) ** 2 / (w0 * w1)
+    between[~np.isfinite(between)] = 0
+    return int(np.argmax(between))
+
+
+def threshold_binary(gray, t):
+    """Fixed global threshold, run in parallel strips"""
+    return run_strips(lambda s: cv2.threshold(s, t, 255, cv2.THRESH_BINARY)[1], gray)
+
+
+def threshold_otsu(gray, analysis=None):
+    """Otsu threshold; returns (threshold, binary image)"""
+    if analysis is None or analysis.gray is not gray:
+        analysis = GrayAnalysis(gray)
+    t = otsu_threshold_value(analysis.histogram())
+    return t, threshold_binary(gray, t)
+
+
+def _check_block_size(block_size):
+    block_size = int(block_size)
+    if block_size % 2 == 0:  # Block size harus ganjil
+        block_size += 1
+    return max(3, min(block_size, MAX_BLOCK_SIZE))
+
+
+def adaptive_threshold_mean(gray, block_size=11, c=2):
+    """Adaptive mean threshold computed per strip with a block_size/2 halo"""
+    bs = _check_block_size(block_size)
+    return run_strips(
+        lambda s: cv2.adaptiveThreshold(s, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, bs, c),
+        gray, halo=bs // 2)
+
+
+def adaptive_threshold_gaussian(gray, block_size=11, c=2):
+    """Adaptive Gaussian threshold computed per strip with a block_size/2 halo"""
+    bs = _check_block_size(block_size)
+    return run_strips(
+        lambda s: cv2.adaptiveThreshold(s, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, bs, c),
+        gray, halo=bs // 2)
+
@@ -0,0 +1,142 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+# Toleransi relatif nilai singular kedua untuk mendeteksi kernel separable
+SEPARABLE_TOL = 1e-6
+
+
+class Kernel:
+    """A precomputed 2-D correlation kernel with its separable factors (if any)"""
+
+    def __init__(self, name, matrix):
+        self.name = name
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if self.matrix.ndim != 2 or self.matrix.size == 0:
+            raise ValueError(f"Kernel '{name}' must be a non-empty 2-D matrix")
+        self.column, self.row = _separate(self.matrix)
+
+    @property
+    def separable(self):
+        return self.row is not None
+
+    @property
+    def size(self):
+        return self.matrix.shape
+
+    def apply(self, img):
+        """Correlate img with the kernel (same semantics as cv2.filter2D(img, -1, k))"""
+        if self.separable:
+            return cv2.sepFilter2D(img, -1, self.row, self.column)
+        # filter2D sendiri sudah beralih ke DFT untuk kernel besar
+        return cv2.filter2D(img, -1, self.matrix)
+
+    def __repr__(self):
+        kind = "separable" if self.separable else "dense"
+        return f"Kernel({self.name!r}, {self.matrix.shape[0]}x{self.matrix.shape[1]}, {kind})"
+
+
+def _separate(matrix):
+    """Rank-1 factorisation k = column * row via SVD, or (None, None)"""
+    if min(matrix.shape) == 1:
+        if matrix.shape[0] == 1:
+            return np.ones((1, 1), np.float32), matrix.reshape(1, -1)
+        return matrix.reshape(-1, 1), np.ones((1, 1), np.float32)
+    u, s, vt = np.linalg.svd(matrix.astype(np.float64))
+    if s[0] == 0 or s[1] > SEPARABLE_TOL * s[0]:
+        return None, None
+    scale = np.sqrt(s[0])
+    column = (u[:, 0] * scale).astype(np.float32).reshape(-1, 1)
+    row = (vt[0] * scale).astype(np.float32).reshape(1, -1)
+    return column, row
+
+
+def sharpen_kernel(strength=1.0):
+    """Laplacian sharpen; strength 1.0 is the classic [[0,-1,0],[-1,5,-1],[0,-1,0]]"""
+    s = float(strength)
+    return np.array([[0, -s, 0], [-s, 1 + 4 * s, -s], [0, -s, 0]], dtype=np.float32)
+
+
+def unsharp_kernel(amount=1.0, ksize=5, sigma=0):
+    """Single kernel equivalent to img + amount * (img - GaussianBlur(img))"""
+    g = cv2.getGaussianKernel(ksize, sigma)
+    blur = g @ g.T
+    identity = np.zeros_like(blur)
+    identity[ksize // 2, ksize // 2] = 1
+    return ((1 + amount) * identity - amount * blur).astype(np.float32)
+
+
+def emboss_kernel(strength=1.0):
+    s = float(strength)
+    return np.array([[-2 * s, -s, 0], [-s, 1, s], [0, s, 2 * s]], dtype=np.float32)
+
+
+def box_kernel(ksize=3):
+    return np.full((ksize, ksize), 1.0 / (ksize * ksize), dtype=np.float32)
+
+
+def load_kernel_matrix(path):
+    """Read a kernel matrix from .npy, .json (nested list) or whitespace/CSV text"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        matrix = np.load(path)
+    elif ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            matrix = np.array(json.load(f), dtype=np.float32)
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read().replace(",", " ")
+        rows = [line.split() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+        matrix = np.array(rows, dtype=np.float32)
+    return np.atleast_2d(matrix)
+
+
+class KernelRegistry:
+    """Named kernel builders plus a cache of built kernels and structuring elements"""
+
+    def __init__(self):
+        self._builders = {}
+        self._cache = {}
+        self._elements = {}
+
+    def register(self, name, builder):
+        """Register builder(**params) -> 2-D matrix under name"""
+        self._builders[name] = builder
+        self._cache = {k: v for k, v in self._cache.items() if k[0] != name}
+
+    def names(self):
+        return list(self._builders)
+
+    def get(self, name, **params):
+        key = (name, tuple(sorted(params.items())))
+        kernel = self._cache.get(key)
+        if kernel is None:
+            if name not in self._builders:
+                raise KeyError(f"Unknown kernel '{name}'")
+            kernel = Kernel(name, self._builders[name](**params))
+            self._cache[key] = kernel
+        return kernel
+
+    def load_file(self, path, name=None):
+        """Load a user-defined matrix from file and register it; returns its name"""
+        matrix = load_kernel_matrix(path)
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        self.register(name, lambda: matrix)
+        return name
+
+    def structuring_element(self, shape=cv2.MORPH_RECT, size=3):
+        key = (shape, size)
+        element = self._elements.get(key)
+        if element is None:
+            element = cv2.getStructuringElement(shape, (size, size))
+            self._elements[key] = element
+        return element
+
+
+KERNELS = KernelRegistry()
+KERNELS.register("Sharpen", sharpen_kernel)
+KERNELS.register("Unsharp Mask", unsharp_kernel)
+KERNELS.register("Emboss", emboss_kernel)
+KERNELS.register("Box", box_kernel)
@@ -0,0 +1,319 @@
+import cv2
+import numpy as np
+
+import approx
+from approx import FINAL
+from enhance import (
+    MAX_BLOCK_SIZE, clahe, equalize_color, equalize_gray,
+    threshold_binary, threshold_otsu, adaptive_threshold_mean, adaptive_threshold_gaussian
+)
+from kernels import KERNELS
+from registry import GLOBAL, NEIGHBORHOOD, POINT, Operation, OperationRegistry, Param
+
+
+def odd_kernel(k):
+    """Kernel harus ganjil dan >= 1"""
+    k = int(k)
+    if k % 2 == 0:
+        k += 1
+    return max(k, 1)
+
+
+def edge_canny(gray, threshold1=100, threshold2=200):
+    return cv2.Canny(gray, int(threshold1), int(threshold2))
+
+
+def sobel_magnitude(gray, ksize=3):
+    """Raw gradient magnitude (float64) from the CV_64F Sobel derivatives"""
+    k = odd_kernel(ksize)
+    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=k)
+    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=k)
+    return np.sqrt(sobelx**2 + sobely**2)
+
+
+def edge_sobel(gray, ksize=3):
+    """Sobel magnitude scaled so the strongest edge is 255"""
+    sobel = sobel_magnitude(gray, ksize)
+    peak = np.max(sobel)
+    return np.uint8(255 * sobel / peak) if peak > 0 else np.zeros_like(sobel, dtype=np.uint8)
+
+
+def edge_laplacian(gray):
+    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+    return np.uint8(np.absolute(laplacian))
+
+
+def _identity_lut():
+    return np.arange(256, dtype=np.uint8)
+
+
+# --- Image Negative / Grayscale -------------------------------------------
+
+def _negative(img, p, ctx):
+    return cv2.bitwise_not(img)
+
+
+def _grayscale(img, p, ctx):
+    return ctx.image.gray
+
+
+# --- Histogram Equalization -------------------------------------------------
+
+EQ_TYPES = ["Global", "CLAHE", "Global (Color)", "CLAHE (Color)"]
+
+
+def _equalize(img, p, ctx):
+    eq_type = p["eq_type"]
+    clip = p["clip_limit"]
+    grid = (p["tile_grid"], p["tile_grid"])
+
+    if eq_type == "Global":
+        a = ctx.analysis()
+        return equalize_gray(a.gray, a)
+    elif eq_type == "CLAHE":
+        a = ctx.analysis()
+        return clahe(a.gray, clip, grid)
+    elif eq_type == "Global (Color)":
+        return equalize_color(img, ycrcb=ctx.image.ycrcb)
+    elif eq_type == "CLAHE (Color)":
+        return equalize_color(img, use_clahe=True, clip_limit=clip, grid=grid, ycrcb=ctx.image.ycrcb)
+    return img
+
+
+# --- Threshold (Binary) -----------------------------------------------------
+
+THRESHOLD_TYPES = ["Fixed", "Otsu", "Adaptive Mean", "Adaptive Gaussian"]
+
+
+def _threshold(img, p, ctx):
+    thresh_type = p["threshold_type"]
+    a = ctx.analysis()
+
+    if thresh_type == "Fixed":
+        return threshold_binary(a.gray, p["threshold"])
+    elif thresh_type == "Otsu":
+        t, th = threshold_otsu(a.gray, a)
+        ctx.feedback["threshold"] = t
+        return th
+    elif thresh_type == "Adaptive Mean":
+        return adaptive_threshold_mean(a.gray, p["block_size"], p["c"])
+    elif thresh_type == "Adaptive Gaussian":
+        return adaptive_threshold_gaussian(a.gray, p["block_size"], p["c"])
+    return a.gray
+
+
+# --- Blurring/Smoothing -----------------------------------------------------
+
+BLUR_TYPES = ["Gaussian Blur", "Median Blur", "Mean Blur", "Bilateral Filter"]
+
+
+def _blur(img, p, ctx):
+    blur_type = p["blur_type"]
+
+    if blur_type == "Gaussian Blur":
+        k = odd_kernel(p["kernel_size"])
+        return cv2.GaussianBlur(img, (k, k), 0)
+
+    elif blur_type == "Median Blur":
+        k = odd_kernel(p["kernel_size"])
+        return approx.median(img, k, ctx.quality)
+
+    elif blur_type == "Mean Blur":
+        k = max(p["kernel_size"], 1)
+        # Mean blur menggunakan box filter
+        return cv2.blur(img, (k, k))
+
+    elif blur_type == "Bilateral Filter":
+        return approx.bilateral(img, p["diameter"], p["sigma"], p["sigma"], ctx.quality)
+    return img
+
+
+# --- Edge Detection ---------------------------------------------------------
+
+EDGE_TYPES = ["Canny", "Sobel", "Laplacian"]
+
+
+def _edges(img, p, ctx):
+    edge_type = p["edge_type"]
+    gray = ctx.image.gray
+
+    if edge_type == "Canny":
+        return edge_canny(gray, p["canny_threshold1"], p["canny_threshold2"])
+    elif edge_type == "Sobel":
+        return edge_sobel(gray, p["sobel_ksize"])
+    elif edge_type == "Laplacian":
+        return edge_laplacian(gray)
+    return gray
+
+
+# --- Morphology -------------------------------------------------------------
+
+def _morphology(op):
+    def run(img, p, ctx):
+        # Default kernel size 3x3 untuk morphology
+        kernel = KERNELS.structuring_element(cv2.MORPH_RECT, 3)
+        _, th = cv2.threshold(ctx.image.gray, 127, 255, cv2.THRESH_BINARY)
+        return cv2.morphologyEx(th, op, kernel)
+    return run
+
+
+# --- Brightness/Contrast, Sharpen ---------------------------------------------
+
+def _brightness_contrast(img, p, ctx):
+    return cv2.convertScaleAbs(img, alpha=p["contrast"], beta=p["brightness"])
+
+
+def _brightness_contrast_lut(p):
+    return cv2.convertScaleAbs(_identity_lut(), alpha=p["contrast"], beta=p["brightness"]).ravel()
+
+
+SHARPEN_KERNELS = ["Sharpen", "Unsharp Mask", "Emboss"]
+
+
+def _sharpen_kernel(p):
+    kernel_name = p["sharpen_kernel"]
+    factor = p["sharpen_factor"] / 100.0
+    if kernel_name == "Sharpen":
+        return KERNELS.get(kernel_name, strength=factor)
+    elif kernel_name == "Unsharp Mask":
+        return KERNELS.get(kernel_name, amount=factor)
+    elif kernel_name == "Emboss":
+        return KERNELS.get(kernel_name, strength=factor)
+    # Kernel custom dari file dipakai apa adanya
+    return KERNELS.get(kernel_name)
+
+
+def _sharpen(img, p, ctx):
+    return _sharpen_kernel(p).apply(img)
+
+
+def _kernel_halo(p):
+    h, w = _sharpen_kernel(p).size
+    return max(h, w) // 2
+
+
+# --- Registry -----------------------------------------------------------------
+
+OPERATIONS = OperationRegistry()
+
+OPERATIONS.register(Operation(
+    "Image Negative", _negative, "Membalik nilai piksel (Invert)",
+    kind=POINT, lut=lambda p: cv2.bitwise_not(_identity_lut()).ravel()))
+
+OPERATIONS.register(Operation(
+    "Grayscale", _grayscale, "Konversi gambar ke skala abu-abu",
+    output_space="GRAY", kind=POINT))
+
+OPERATIONS.register(Operation(
+    "Histogram Equalization", _equalize, "Pemerataan histogram (global, CLAHE, atau luminance berwarna)",
+    params=[
+        Param("eq_type", "Equalization:", choices=EQ_TYPES, default="Global"),
+        Param("clip_limit", "Clip Limit:", float, 2.0, 0.5, 40.0, 0.5, widget="spin",
+              visible_when={"eq_type": ["CLAHE", "CLAHE (Color)"]}),
+        Param("tile_grid", "Tile Grid:", int, 8, 1, 64, widget="spin",
+              visible_when={"eq_type": ["CLAHE", "CLAHE (Color)"]}),
+    ],
+    output_space="GRAY", kind=GLOBAL, tileable=False, scratch=1, variant_param="eq_type",
+    variants={
+        # YCrCb + salinan yang di-equalize
+        "Global (Color)": {"output_space": "BGR", "scratch": 6},
+        "CLAHE (Color)": {"output_space": "BGR", "scratch": 6},
+    }))
+
+OPERATIONS.register(Operation(
+    "Threshold (Binary)", _threshold, "Konversi ke gambar biner hitam-putih (fixed, Otsu, adaptive)",
+    params=[
+        Param("threshold_type", "Threshold Type:", choices=THRESHOLD_TYPES, default="Fixed"),
+        Param("threshold", "Threshold:", int, 127, 0, 255, widget="spin",
+              visible_when={"threshold_type": ["Fixed"]}),
+        Param("block_size", "Block Size:", int, 11, 3, MAX_BLOCK_SIZE,
+              visible_when={"threshold_type": ["Adaptive Mean", "Adaptive Gaussian"]}),
+        Param("c", "Constant C:", float, 2.0, -50, 50, 1, widget="spin",
+              visible_when={"threshold_type": ["Adaptive Mean", "Adaptive Gaussian"]}),
+    ],
+    output_space="GRAY", kind=POINT, scratch=1, variant_param="threshold_type",
+    variants={
+        "Otsu": {"kind": GLOBAL, "tileable": False},
+        "Adaptive Mean": {"kind": NEIGHBORHOOD, "halo": lambda p: odd_kernel(p["block_size"]) // 2, "scratch": 2},
+        "Adaptive Gaussian": {"kind": NEIGHBORHOOD, "halo": lambda p: odd_kernel(p["block_size"]) // 2,
+                              "scratch": 2},
+    }))
+
+OPERATIONS.register(Operation(
+    "Blurring/Smoothing", _blur, "Berbagai teknik blur dan smoothing gambar",
+    params=[
+        Param("blur_type", "Blur Type:", choices=BLUR_TYPES, default="Gaussian Blur"),
+        Param("kernel_size", "Kernel Size:", int, 3, 1, 31,
+              visible_when={"blur_type": ["Gaussian Blur", "Median Blur", "Mean Blur"]}),
+        Param("diameter", "Diameter:", int, 9, 5, 50, visible_when={"blur_type": ["Bilateral Filter"]}),
+        Param("sigma", "Sigma:", int, 75, 10, 200, visible_when={"blur_type": ["Bilateral Filter"]}),
+    ],
+    kind=NEIGHBORHOOD, halo=lambda p: odd_kernel(p["kernel_size"]) // 2, variant_param="blur_type",
+    variants={
+        "Median Blur": {"draft": True},
+        "Bilateral Filter": {"halo": lambda p: p["diameter"] // 2, "draft": True, "scratch": 3},
+    }))
+
+OPERATIONS.register(Operation(
+    "Edge Detection", _edges, "Berbagai teknik deteksi tepi pada gambar",
+    params=[
+        Param("edge_type", "Edge Type:", choices=EDGE_TYPES, default="Canny"),
+        Param("canny_threshold1", "Threshold 1:", int, 100, 10, 300, visible_when={"edge_type": ["Canny"]}),
+        Param("canny_threshold2", "Threshold 2:", int, 200, 10, 300, visible_when={"edge_type": ["Canny"]}),
+        Param("sobel_ksize", "Kernel Size:", int, 3, 1, 7, visible_when={"edge_type": ["Sobel"]}),
+    ],
+    output_space="GRAY", kind=NEIGHBORHOOD, halo=1, scratch=17, variant_param="edge_type",
+    variants={
+        # Hysteresis Canny dan normalisasi Sobel (dibagi max) butuh seluruh gambar
+        "Canny": {"tileable": False, "scratch": 8},
+        # gray + dua turunan float64 + magnitude
+        "Sobel": {"kind": GLOBAL, "tileable": False, "scratch": 25},
+    }))
+
+for _name, _op, _desc, _halo in [
+    ("Morphology (Open)", cv2.MORPH_OPEN, "Operasi morfologi opening", 2),
+    ("Morphology (Close)", cv2.MORPH_CLOSE, "Operasi morfologi closing", 2),
+    ("Dilation", cv2.MORPH_DILATE, "Operasi dilasi (memperbesar objek)", 1),
+    ("Erosion", cv2.MORPH_ERODE, "Operasi erosi (memperkecil objek)", 1),
+]:
+    OPERATIONS.register(Operation(_name, _morphology(_op), _desc, output_space="GRAY",
+                                  kind=NEIGHBORHOOD, halo=_halo, scratch=2))
+
+OPERATIONS.register(Operation(
+    "Brightness/Contrast Adjustment", _brightness_contrast, "Penyesuaian brightness dan contrast",
+    params=[
+        Param("brightness", "Brightness:", float, 0.0, -100, 100, 5, widget="spin"),
+        Param("contrast", "Contrast:", float, 1.0, 0.5, 3.0, 0.1, widget="spin"),
+    ],
+    kind=POINT, lut=_brightness_contrast_lut))
+
+OPERATIONS.register(Operation(
+    "Sharpen / Contrast", _sharpen, "Penajaman dan peningkatan kontras",
+    params=[
+        Param("sharpen_kernel", "Kernel:", choices=SHARPEN_KERNELS, default="Sharpen",
+              loader=KERNELS.load_file, file_filter="Kernel (*.txt *.csv *.json *.npy)"),
+        Param("sharpen_factor", "Sharpness Factor:", int, 100, 50, 300),
+    ],
+    kind=NEIGHBORHOOD, halo=_kernel_halo, scratch=3))
+
+
+def compose_luts(luts):
+    """Fuse a chain of 256-entry LUTs into one (applied left to right)"""
+    out = _identity_lut()
+    for lut in luts:
+        out = lut[out]
+    return out
+
+
+def apply_operation(img, method, params=None, analysis=None, feedback=None, quality=FINAL):
+    """Run one registered method on a BGR image and return the result (BGR or gray).
+
+    analysis is an optional GrayAnalysis (or a callable returning one) of img's
+    gray version whose histogram can be reused; values the operation computed
+    (e.g. the Otsu threshold) are written into feedback.
+    quality "draft" selects the approximate path of ops that declare one.
+    """
+    op = OPERATIONS.get(method)
+    if op is None:
+        return img
+    return op.run(img, params, analysis, feedback, quality)
@@ -0,0 +1,181 @@
+from PySide6.QtWidgets import (
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFileDialog, QSlider,
+    QSpinBox, QDoubleSpinBox, QComboBox
+)
+from PySide6.QtCore import Qt, Signal
+
+LABEL_STYLE = "color: #343a40; font-weight: bold;"
+VALUE_STYLE = "font-weight: bold; color: #343a40;"
+COMBO_STYLE = """
+    QComboBox {
+        border: 1px solid #ced4da;
+        border-radius: 5px;
+        padding: 5px;
+        background-color: #ffffff;
+        color: #343a40;
+        font-weight: bold;
+    }
+"""
+SPIN_STYLE = """
+    QSpinBox, QDoubleSpinBox {
+        border: 1px solid #ced4da;
+        border-radius: 5px;
+        padding: 5px;
+        background-color: #ffffff;
+        color: #343a40;
+        font-weight: bold;
+    }
+"""
+LOAD_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #ffffff;
+        border: 1px solid #ced4da;
+        border-radius: 5px;
+        padding: 5px;
+        color: #495057;
+    }
+    QPushButton:hover {
+        background-color: #e9ecef;
+    }
+"""
+
+
+class ParamPanel(QWidget):
+    """Parameter controls generated from an Operation's Param declarations.
+
+    Sliders, spin boxes and combos are built per parameter; rows whose
+    visible_when condition fails are hidden, and changing a combo resets the
+    parameters that depend on it to their defaults.
+    """
+
+    changed = Signal()
+    loaded = Signal(str, str, str)  # parameter, new choice, file it was loaded from
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout_ = QVBoxLayout(self)
+        self.layout_.setSpacing(8)
+        self.layout_.setContentsMargins(0, 0, 0, 0)
+        self.operation = None
+        self.rows = {}     # name -> row widget
+        self.editors = {}  # name -> input widget
+
+    def set_operation(self, op):
+        """Rebuild the controls for op (None clears the panel), all at defaults"""
+        for row in self.rows.values():
+            row.setParent(None)
+            row.deleteLater()
+        self.rows, self.editors = {}, {}
+        self.operation = op
+        if op is None:
+            return
+        for p in op.params:
+            row, editor = self._build_row(p)
+            self.rows[p.name] = row
+            self.editors[p.name] = editor
+            self.layout_.addWidget(row)
+        self._update_visibility()
+
+    def _build_row(self, p):
+        row = QWidget()
+        layout = QHBoxLayout(row)
+        label = QLabel(p.label)
+        label.setStyleSheet(LABEL_STYLE)
+        label.setToolTip(p.help)
+        layout.addWidget(label)
+
+        if p.widget == "combo":
+            editor = QComboBox()
+            editor.addItems([str(c) for c in p.choices])
+            editor.setCurrentText(str(p.default))
+            editor.setStyleSheet(COMBO_STYLE)
+            editor.currentTextChanged.connect(lambda _, name=p.name: self._combo_changed(name))
+            layout.addWidget(editor)
+            if p.loader is not None:
+                btn = QPushButton("📂 Load...")
+                btn.setStyleSheet(LOAD_BUTTON_STYLE)
+                btn.clicked.connect(lambda _=False, param=p: self._load_choice(param))
+                layout.addWidget(btn)
+        elif p.widget == "spin":
+            editor = QDoubleSpinBox() if p.type is float else QSpinBox()
+            if p.minimum is not None and p.maximum is not None:
+                editor.setRange(p.minimum, p.maximum)
+            editor.setSingleStep(p.step)
+            editor.setValue(p.default)
+            editor.setStyleSheet(SPIN_STYLE)
+            editor.valueChanged.connect(self.changed)
+            layout.addWidget(editor)
+        else:
+            editor = QSlider(Qt.Horizontal)
+            editor.setRange(int(p.minimum), int(p.maximum))
+            editor.setSingleStep(int(p.step))
+            editor.setValue(int(p.default))
+            value = QLabel(str(p.default))
+            value.setStyleSheet(VALUE_STYLE)
+            editor.valueChanged.connect(lambda v, value=value: value.setText(str(v)))
+            editor.valueChanged.connect(self.changed)
+            layout.addWidget(editor)
+            layout.addWidget(value)
+        return row, editor
+
+    def _combo_changed(self, name):
+        # Parameter yang tergantung pada combo ini kembali ke default
+        for p in self.operation.params:
+            if name in p.visible_when:
+                self._set_value(p, p.default)
+        self._update_visibility()
+        self.changed.emit()
+
+    def _load_choice(self, p):
+        path, _ = QFileDialog.getOpenFileName(self, f"Open {p.label.rstrip(':')}", "", p.file_filter)
+        if not path:
+            return
+        try:
+            choice = p.loader(path)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {path}: {e}")
+            return
+        self.add_choice(p.name, choice)
+        self.loaded.emit(p.name, choice, path)
+
+    def add_choice(self, name, choice):
+        """Add (if new) and select a combo choice"""
+        combo = self.editors[name]
+        if combo.findText(choice) < 0:
+            combo.addItem(choice)
+        combo.setCurrentText(choice)
+
+    def _update_visibility(self):
+        values = self.values()
+        for p in self.operation.params:
+            self.rows[p.name].setVisible(p.is_visible(values))
+
+    def _set_value(self, p, value):
+        editor = self.editors[p.name]
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(str(value))
+        else:
+            editor.setValue(value)
+
+    def values(self):
+        """Current values of all parameters (hidden ones included)"""
+        if self.operation is None:
+            return {}
+        out = {}
+        for p in self.operation.params:
+            editor = self.editors[p.name]
+            raw = editor.currentText() if isinstance(editor, QComboBox) else editor.value()
+            out[p.name] = p.coerce(raw)
+        return out
+
+    def set_values(self, values):
+        """Set the given parameters (unknown names are ignored)"""
+        if self.operation is None:
+            return
+        for p in self.operation.params:
+            if p.name in values:
+                if p.widget == "combo":
+                    self.add_choice(p.name, str(values[p.name]))
+                else:
+                    self._set_value(p, p.coerce(values[p.name]))
+        self._update_visibility()
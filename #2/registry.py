@@ -0,0 +1,212 @@
+"""Declarative registry of processing operations.
+
+An Operation declares its parameters, colour spaces and scheduling hints
+(point / neighborhood / global, tileable, halo, LUT-composable); the GUI
+parameter panels, CLI options and dispatch are all generated from it.
+Third-party packages can add operations through the entry point group
+``imgproc.operations``; an entry point may resolve to an Operation, a list
+of Operations, or a callable taking the registry.
+"""
+from importlib import metadata
+
+from approx import FINAL
+from colorimage import GRAY, ColorImage
+
+ENTRY_POINT_GROUP = "imgproc.operations"
+
+POINT = "point"
+NEIGHBORHOOD = "neighborhood"
+GLOBAL = "global"
+
+
+class Param:
+    """One operation parameter and how to present it.
+
+    widget is "slider", "spin" or "combo"; visible_when maps another
+    parameter's name to the values for which this one is shown. A combo with
+    a loader also gets a Load button that calls loader(path) -> new choice.
+    """
+
+    def __init__(self, name, label, type=int, default=0, minimum=None, maximum=None, step=1,
+                 choices=None, widget=None, visible_when=None, loader=None, file_filter="", help=""):
+        self.name = name
+        self.label = label
+        self.type = str if choices is not None else type
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.step = step
+        self.choices = list(choices) if choices is not None else None
+        self.widget = widget or ("combo" if choices is not None else "slider")
+        self.visible_when = visible_when or {}
+        self.loader = loader
+        self.file_filter = file_filter
+        self.help = help or label.rstrip(":")
+
+    def is_visible(self, values):
+        return all(values.get(k) in allowed for k, allowed in self.visible_when.items())
+
+    def coerce(self, value):
+        value = self.type(value)
+        if self.type is not str:
+            if self.minimum is not None:
+                value = max(value, self.type(self.minimum))
+            if self.maximum is not None:
+                value = min(value, self.type(self.maximum))
+        return value
+
+
+class OperationContext:
+    """Per-run services for operation functions.
+
+    `image` is the input ColorImage: use image.gray, image.ycrcb, ... instead
+    of cvtColor so each conversion is done (and cached) once per image.
+    """
+
+    def __init__(self, image, analysis=None, quality=FINAL):
+        self.image = image
+        self._analysis = analysis
+        self.quality = quality  # "final" (exact) atau "draft" (aproksimasi cepat)
+        self.feedback = {}  # nilai parameter hasil hitungan (mis. threshold Otsu)
+
+    def analysis(self):
+        """GrayAnalysis of the input (the caller's, or the image's cached one)"""
+        if callable(self._analysis):
+            self._analysis = self._analysis()
+        if self._analysis is None:
+            self._analysis = self.image.analysis()
+        return self._analysis
+
+
+class Operation:
+    """A processing method: fn(img, params, ctx) -> result, plus its declaration.
+
+    fn receives the input converted to input_space (img) and the
+    OperationContext whose `image` holds the cached conversions.
+
+    Hints (kind, output_space, halo, tileable, lut, draft, scratch) may be
+    overridden per value of variant_param through `variants`; halo, lut and
+    scratch may be callables taking the resolved params. draft=True means fn
+    has a faster approximate path when ctx.quality is "draft"; scratch is the
+    temporary memory fn needs, in bytes per input pixel.
+    """
+
+    def __init__(self, name, fn, description="", params=(), input_space="BGR", output_space="BGR",
+                 kind=POINT, halo=0, tileable=True, lut=None, variant_param=None, variants=None, draft=False,
+                 scratch=0):
+        self.name = name
+        self.fn = fn
+        self.description = description
+        self.params = list(params)
+        self.input_space = input_space
+        self.output_space = output_space
+        self.kind = kind
+        self.halo = halo
+        self.tileable = tileable
+        self.lut = lut
+        self.variant_param = variant_param
+        self.variants = variants or {}
+        self.draft = draft
+        self.scratch = scratch
+
+    def param(self, name):
+        for p in self.params:
+            if p.name == name:
+                return p
+        raise KeyError(name)
+
+    def defaults(self):
+        return {p.name: p.default for p in self.params}
+
+    def resolve(self, params=None):
+        """Defaults overridden by the given values (unknown keys are ignored)"""
+        values = self.defaults()
+        for p in self.params:
+            if params and p.name in params:
+                values[p.name] = p.coerce(params[p.name])
+        return values
+
+    def hints(self, params=None):
+        """Scheduler hints for these params: kind, colour spaces, halo, tileable, LUT, draft, scratch"""
+        values = self.resolve(params)
+        decl = {
+            "kind": self.kind, "input_space": self.input_space, "output_space": self.output_space,
+            "halo": self.halo, "tileable": self.tileable, "lut": self.lut, "draft": self.draft,
+            "scratch": self.scratch,
+        }
+        if self.variant_param is not None:
+            decl.update(self.variants.get(values[self.variant_param], {}))
+        for name in ("halo", "scratch"):
+            if callable(decl[name]):
+                decl[name] = decl[name](values)
+        lut = decl.pop("lut")
+        decl["lut_composable"] = lut is not None
+        return decl
+
+    def lut_for(self, params=None):
+        """256-entry uint8 lookup table if this op is a pure per-value map, else None"""
+        values = self.resolve(params)
+        lut = self.lut
+        if self.variant_param is not None:
+            lut = self.variants.get(values[self.variant_param], {}).get("lut", lut)
+        return lut(values) if callable(lut) else lut
+
+    def run(self, img, params=None, analysis=None, feedback=None, quality=FINAL):
+        """Apply to an array or ColorImage; returns the result array"""
+        image = ColorImage.wrap(img)
+        ctx = OperationContext(image, analysis, quality)
+        result = self.fn(image.get(self.input_space), self.resolve(params), ctx)
+        if feedback is not None:
+            feedback.update(ctx.feedback)
+        return result
+
+    def apply(self, image, params=None, analysis=None, feedback=None, store=None, key=None, quality=FINAL):
+        """Like run() but returns a ColorImage tagged with the output colour space"""
+        result = self.run(image, params, analysis, feedback, quality)
+        space = GRAY if result.ndim == 2 else self.hints(params)["output_space"]
+        return ColorImage(result, space, store, key)
+
+
+class OperationRegistry:
+    def __init__(self):
+        self._ops = {}
+        self._plugins_loaded = False
+
+    def register(self, op):
+        self._ops[op.name] = op
+        return op
+
+    def get(self, name):
+        return self._ops.get(name)
+
+    def names(self):
+        return list(self._ops)
+
+    def __iter__(self):
+        return iter(self._ops.values())
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __contains__(self, name):
+        return name in self._ops
+
+    def load_plugins(self):
+        """Register operations from installed entry points (once)"""
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        eps = metadata.entry_points()
+        eps = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+        for ep in eps:
+            try:
+                obj = ep.load()
+                if isinstance(obj, Operation):
+                    self.register(obj)
+                elif isinstance(obj, (list, tuple)):
+                    for op in obj:
+                        self.register(op)
+                elif callable(obj):
+                    obj(self)
+            except Exception as e:
+                print(f"Error loading operation plugin {ep.name}: {e}")
@@ -0,0 +1,240 @@
+"""Priority, memory-aware scheduling of processing jobs.
+
+Interactive work (the GUI's apply) and batch work share one pool of
+worker threads (OpenCV releases the GIL). Interactive jobs are always
+started first, and the pool has extra reserve threads on top of `workers`
+that only interactive jobs may use, so a long batch job never makes an
+apply wait (even on one core). Queued batches take turns round-robin so
+one big batch cannot starve another.
+The scheduler limits how many jobs run, not how many cores one job uses:
+interactive jobs fan out over the whole tile pool, batch jobs over at most
+`batch_threads` strips (tiling.limit_workers). OpenCV's own threading
+(cv2.setNumThreads) is process-wide, so a single OpenCV call in a batch
+job (e.g. bilateralFilter) can still use every core. To isolate batch work
+completely, run it in worker processes like session.replay without a
+scheduler does (cv2.setNumThreads(1) and os.nice(BATCH_NICE) per worker).
+Every job carries a memory estimate and is only started while the total
+of running estimates stays within the RAM budget (a job that alone
+exceeds the budget still runs, but only when nothing else is running).
+
+    future = get_scheduler().submit(op.run, img, params, priority=INTERACTIVE,
+                                    memory=estimate_memory(op, img.shape, params))
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import tiling
+from approx import DRAFT, FINAL
+from workingset import available_memory
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+RAM_BUDGET_ENV = "IMGPROC_RAM_BUDGET_MB"
+DEFAULT_RAM_BUDGET = 1 << 30  # bila RAM yang tersedia tidak bisa dibaca
+WAIT_HISTORY = 100            # jumlah job terakhir untuk statistik waktu tunggu
+BATCH_NICE = 10               # prioritas OS untuk proses worker batch (replay)
+
+# Buffer float32 guided upsampling (a, b, a*guide) per pixel untuk versi draft
+DRAFT_SCRATCH_BYTES = 24
+CHANNELS = {"GRAY": 1, "Y": 1}
+
+
+def default_ram_budget():
+    """IMGPROC_RAM_BUDGET_MB if set, otherwise half of the currently available RAM"""
+    env = os.environ.get(RAM_BUDGET_ENV)
+    if env:
+        return int(float(env) * (1 << 20))
+    available = available_memory()
+    return available // 2 if available else DEFAULT_RAM_BUDGET
+
+
+def estimate_memory(op, shape, params=None, quality=FINAL, include_input=False):
+    """Peak bytes op allocates for an 8-bit image of this shape: output plus scratch buffers"""
+    pixels = shape[0] * shape[1]
+    channels = shape[2] if len(shape) > 2 else 1
+    hints = op.hints(op.resolve(params))
+    per_pixel = CHANNELS.get(hints["output_space"], 3) + hints["scratch"]
+    if quality == DRAFT and hints["draft"]:
+        per_pixel += DRAFT_SCRATCH_BYTES
+    if include_input:
+        per_pixel += channels
+    return int(pixels * per_pixel)
+
+
+def estimate_pipeline_memory(steps, shape, quality=FINAL):
+    """Peak bytes of [(op, params)] run in sequence: the largest step plus its input"""
+    return max((estimate_memory(op, shape, params, quality, include_input=True) for op, params in steps), default=0)
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "priority", "memory", "batch", "future", "queued")
+
+    def __init__(self, fn, args, kwargs, priority, memory, batch):
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.priority, self.memory, self.batch = priority, memory, batch
+        self.future = Future()
+        self.queued = time.monotonic()
+
+
+class JobScheduler:
+    """Runs jobs on a thread pool by priority class, within a RAM budget.
+
+    submit() returns a concurrent.futures.Future; cancelling it before the
+    job starts removes the job from the queue.
+    """
+
+    def __init__(self, workers=None, ram_budget=None, interactive_reserve=1, batch_threads=1):
+        self.workers = max(1, workers or tiling.DEFAULT_WORKERS)
+        self.ram_budget = ram_budget or default_ram_budget()
+        # Thread tambahan di atas `workers`, hanya untuk job interaktif
+        self.interactive_reserve = max(0, interactive_reserve)
+        # Jumlah strip paralel maksimum per job batch (job interaktif memakai semua)
+        self.batch_threads = max(1, batch_threads)
+        self._lock = threading.Lock()
+        self._interactive = deque()
+        self._batches = OrderedDict()  # batch id -> deque job, dilayani bergiliran
+        self._running = {INTERACTIVE: 0, BATCH: 0}
+        self._memory = 0
+        self._waits = {p: deque(maxlen=WAIT_HISTORY) for p in PRIORITY_NAMES}
+        self._completed = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=self.workers + self.interactive_reserve,
+                                            thread_name_prefix="job")
+
+    def submit(self, fn, *args, priority=BATCH, memory=0, batch=None, **kwargs):
+        """Queue fn(*args, **kwargs); batch groups jobs that share fairly with other batches"""
+        job = _Job(fn, args, kwargs, priority, int(memory), batch)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new jobs after shutdown")
+            if priority == INTERACTIVE:
+                self._interactive.append(job)
+            else:
+                self._batches.setdefault(batch, deque()).append(job)
+        self._dispatch()
+        return job.future
+
+    def cancel_batch(self, batch):
+        """Cancel every queued job of a batch (running jobs finish); returns how many"""
+        with self._lock:
+            jobs = self._batches.pop(batch, ())
+        return sum(job.future.cancel() for job in jobs)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._interactive) + [job for queue in self._batches.values() for job in queue]
+            self._interactive.clear()
+            self._batches.clear()
+        for job in jobs:
+            job.future.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _admits(self, job):
+        running = self._running[INTERACTIVE] + self._running[BATCH]
+        return running == 0 or self._memory + job.memory <= self.ram_budget
+
+    def _next_job(self):
+        """Pop the next job allowed to start now, or None (caller holds the lock)"""
+        if self._running[INTERACTIVE] + self._running[BATCH] >= self.workers + self.interactive_reserve:
+            return None
+        if self._interactive:
+            # Selama ada job interaktif yang menunggu, tidak ada batch baru yang dimulai
+            if not self._admits(self._interactive[0]):
+                return None
+            return self._interactive.popleft()
+        if not self._batches or self._running[BATCH] + self._running[INTERACTIVE] >= self.workers:
+            return None
+        batch, queue = next(iter(self._batches.items()))
+        if not self._admits(queue[0]):
+            return None
+        job = queue.popleft()
+        # Giliran pindah ke batch berikutnya
+        del self._batches[batch]
+        if queue:
+            self._batches[batch] = queue
+        return job
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                if job is None:
+                    return
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self._running[job.priority] += 1
+                self._memory += job.memory
+                self._waits[job.priority].append(time.monotonic() - job.queued)
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        threads = self.batch_threads if job.priority == BATCH else tiling.DEFAULT_WORKERS
+        try:
+            with tiling.limit_workers(threads):
+                result = job.fn(*job.args, **job.kwargs)
+            error = None
+        except BaseException as e:
+            result, error = None, e
+        # Memori dilepas sebelum hasil dikirim, supaya callback melihat stats yang konsisten
+        with self._lock:
+            self._running[job.priority] -= 1
+            self._memory -= job.memory
+            self._completed += 1
+        if error is None:
+            job.future.set_result(result)
+        else:
+            job.future.set_exception(error)
+        self._dispatch()
+
+    def stats(self):
+        """Queue depth, running jobs, memory in use and wait times (seconds) per priority class"""
+        now = time.monotonic()
+        with self._lock:
+            queued = {INTERACTIVE: list(self._interactive),
+                      BATCH: [job for queue in self._batches.values() for job in queue]}
+            stats = {
+                "running": {PRIORITY_NAMES[p]: n for p, n in self._running.items()},
+                "workers": self.workers,
+                "reserve": self.interactive_reserve,
+                "batch_threads": self.batch_threads,
+                "memory": self._memory,
+                "ram_budget": self.ram_budget,
+                "batches": len(self._batches),
+                "completed": self._completed,
+                "queued": {}, "wait": {},
+            }
+            for p, name in PRIORITY_NAMES.items():
+                jobs = [job for job in queued[p] if not job.future.cancelled()]
+                waits = list(self._waits[p])
+                stats["queued"][name] = len(jobs)
+                stats["wait"][name] = {
+                    "mean": sum(waits) / len(waits) if waits else 0.0,
+                    "max": max(waits, default=0.0),
+                    "oldest": max((now - job.queued for job in jobs), default=0.0),
+                }
+        return stats
+
+
+def format_queue(stats):
+    wait = stats["wait"]
+    return (f"Queue {stats['queued']['interactive']} interactive / {stats['queued']['batch']} batch "
+            f"({stats['batches']} batches) | running {sum(stats['running'].values())}/{stats['workers'] + stats['reserve']} | "
+            f"RAM {stats['memory'] / (1 << 20):.0f}/{stats['ram_budget'] / (1 << 20):.0f} MB | "
+            f"wait {wait['interactive']['mean'] * 1000:.0f} ms / {wait['batch']['mean'] * 1000:.0f} ms")
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """Shared scheduler used by the GUI and scheduled replays"""
+    global _scheduler
+    if _scheduler is None or _scheduler._closed:
+        _scheduler = JobScheduler()
+    return _scheduler
@@ -0,0 +1,226 @@
+"""Session recording and headless replay of applied operations.
+
+The GUI records every applied operation with its full (resolved)
+parameters into a JSON manifest; `pipeline` holds the steps that produced
+the current result. Replay runs that pipeline over a whole folder in
+worker processes, mirroring the folder layout in the output directory.
+Given a JobScheduler, replay instead runs its chunks as batch jobs on the
+scheduler's threads, admitted against its RAM budget and sharing fairly
+with other batches and with interactive work.
+
+    python cli.py replay session.json IN_DIR OUT_DIR --workers 8
+    python cli.py replay session.json IN_DIR OUT_DIR --shard 0/4 --skip-existing
+    python cli.py replay session.json IN_DIR OUT_DIR --threads --ram-budget 2048
+"""
+import datetime
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+import tiling
+from approx import FINAL
+from dataset_stats import chunked, iter_images, stream_chunks
+from operations import OPERATIONS
+from scheduler import BATCH, BATCH_NICE, estimate_pipeline_memory
+
+SESSION_ENV = "IMGPROC_SESSION"  # path manifest yang disimpan otomatis tiap apply
+MANIFEST_VERSION = 1
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class SessionRecorder:
+    """Collects applied operations; saves after every change if `path` is set"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.created = _now()
+        self.history = []   # semua operasi yang pernah di-apply
+        self.pipeline = []  # langkah yang menghasilkan result saat ini
+        self.files = {}     # nilai parameter hasil load file -> path file
+
+    def note_file(self, value, path):
+        """Remember that a parameter value (e.g. a custom kernel) was loaded from path"""
+        self.files[value] = os.path.abspath(path)
+
+    def record(self, method, params, source=None, feedback=None, quality=FINAL):
+        """Record one applied operation; the pipeline becomes just this step (applied to the original)"""
+        op = OPERATIONS.get(method)
+        step = {"method": method, "params": op.resolve(params) if op else dict(params or {})}
+        files = {k: self.files[v] for k, v in step["params"].items() if isinstance(v, str) and v in self.files}
+        if files:
+            step["files"] = files
+        entry = dict(step, time=_now())
+        if source:
+            entry["source"] = source
+        if feedback:
+            entry["feedback"] = feedback
+        if quality != FINAL:
+            entry["quality"] = quality  # hanya info; replay memakai --quality (default final)
+        self.history.append(entry)
+        self.pipeline = [step]
+        self._autosave()
+
+    def reset(self):
+        self.pipeline = []
+        self.history.append({"method": None, "reset": True, "time": _now()})
+        self._autosave()
+
+    def manifest(self):
+        return {
+            "version": MANIFEST_VERSION,
+            "created": self.created,
+            "saved": _now(),
+            "pipeline": self.pipeline,
+            "history": self.history,
+        }
+
+    def save(self, path=None):
+        path = path or self.path
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest(), f, indent=1, default=_json_default)
+        os.replace(tmp, path)
+
+    def _autosave(self):
+        if self.path:
+            try:
+                self.save()
+            except OSError as e:
+                print(f"Error saving session {self.path}: {e}")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def load_manifest(path):
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version", 0) > MANIFEST_VERSION:
+        raise ValueError(f"{path}: manifest version {manifest['version']} is newer than supported")
+    return manifest
+
+
+def prepare_pipeline(steps):
+    """Check the steps against the registry and load file-backed parameter values.
+
+    Returns [(Operation, params)]; raises ValueError for unknown methods.
+    """
+    prepared = []
+    for step in steps:
+        op = OPERATIONS.get(step["method"])
+        if op is None:
+            raise ValueError(f"Unknown method in manifest: {step['method']}")
+        params = dict(step.get("params", {}))
+        for name, path in step.get("files", {}).items():
+            param = op.param(name)
+            if param.loader is not None:
+                params[name] = param.loader(path)
+        prepared.append((op, op.resolve(params)))
+    return prepared
+
+
+def run_pipeline(img, prepared, quality=FINAL):
+    for op, params in prepared:
+        img = op.run(img, params, quality=quality)
+    return img
+
+
+def output_path(path, root, out_dir, ext=None):
+    rel = os.path.relpath(path, root)
+    if ext:
+        rel = os.path.splitext(rel)[0] + ext
+    return os.path.join(out_dir, rel)
+
+
+def _init_worker():
+    # Satu proses per core: thread internal OpenCV/tiling hanya menambah kontensi
+    cv2.setNumThreads(1)
+    tiling.DEFAULT_WORKERS = 1
+    # Replay adalah kerja batch: GUI yang berjalan bersamaan tetap didahulukan oleh OS
+    if hasattr(os, "nice"):
+        try:
+            os.nice(BATCH_NICE)
+        except OSError:
+            pass
+
+
+def replay_chunk(paths, root, out_dir, steps, ext=None, skip_existing=False, quality=FINAL, shapes=None):
+    """Worker entry point: run the pipeline over paths; returns (done, skipped, failed paths).
+
+    shapes, if given, collects the shape of every decoded image.
+    """
+    prepared = prepare_pipeline(steps)
+    done, skipped, failed = 0, 0, []
+    for path in paths:
+        target = output_path(path, root, out_dir, ext)
+        if skip_existing and os.path.exists(target):
+            skipped += 1
+            continue
+        try:
+            img = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                raise ValueError("cannot decode image")
+            if shapes is not None:
+                shapes.append(img.shape)
+            result = run_pipeline(img, prepared, quality)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            ok, buf = cv2.imencode(os.path.splitext(target)[1] or ".png", result)
+            if not ok:
+                raise ValueError("cannot encode result")
+            buf.tofile(target)
+            done += 1
+        except (OSError, ValueError, cv2.error) as e:
+            failed.append(f"{path}: {e}")
+    return done, skipped, failed
+
+
+def replay(manifest, root, out_dir, workers=None, chunk_size=64, shard=None, ext=None,
+           skip_existing=False, progress=None, quality=FINAL, scheduler=None):
+    """Re-run a manifest's pipeline over every image under root; returns (done, skipped, failed)
+
+    With a scheduler, chunks run as one batch of BATCH jobs on its threads
+    (workers is then ignored); each job's memory estimate is the pipeline's
+    peak for the largest image seen so far.
+    """
+    steps = manifest["pipeline"]
+    prepared = prepare_pipeline(steps)  # gagal cepat sebelum worker dijalankan
+    chunks = chunked(iter_images(root, shard), chunk_size)
+    workers = workers or os.cpu_count() or 1
+    totals = [0, 0, []]
+
+    def collect(finished):
+        for future in finished:
+            done, skipped, failed = future.result()
+            totals[0] += done
+            totals[1] += skipped
+            totals[2].extend(failed)
+            if progress:
+                progress(*totals)
+
+    if scheduler is not None:
+        shapes = []
+        batch = f"replay:{out_dir}"
+
+        def submit(chunk):
+            memory = estimate_pipeline_memory(prepared, max(shapes, key=lambda s: s[0] * s[1]), quality) \
+                if shapes else 0
+            return scheduler.submit(replay_chunk, chunk, root, out_dir, steps, ext, skip_existing, quality,
+                                    shapes, priority=BATCH, memory=memory, batch=batch)
+
+        # Sebelum ukuran gambar diketahui estimasinya 0, jadi hanya satu chunk yang jalan
+        stream_chunks(submit, chunks, lambda: 2 * scheduler.workers if shapes else 1, collect)
+        return tuple(totals)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        stream_chunks(lambda chunk: pool.submit(replay_chunk, chunk, root, out_dir, steps, ext, skip_existing, quality),
+                chunks, lambda: 2 * workers, collect)
+    return tuple(totals)
@@ -0,0 +1,66 @@
+"""Shared test inputs: deterministic synthetic images and the bundled images in image/.
+
+The plain functions are used where inputs are needed at collection time
+(parametrize, golden updates); tests otherwise take the fixtures.
+"""
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# Modul aplikasi ada satu folder di atas tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "image")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "speed: per-method time budget (skip with SKIP_SPEED_GATE=1)")
+
+
+def pattern(h, w):
+    """Deterministic BGR test pattern: gradients, hashed noise and drawn shapes"""
+    y, x = np.mgrid[0:h, 0:w].astype(np.int64)
+    noise = ((x * 73856093) ^ (y * 19349663)) % 256
+    img = np.dstack([
+        (x * 255 // max(w - 1, 1)),
+        (y * 255 // max(h - 1, 1)),
+        (noise + x + y) % 256,
+    ]).astype(np.uint8)
+    cv2.rectangle(img, (w // 8, h // 8), (w // 2, h // 2), (255, 255, 255), -1)
+    cv2.circle(img, (3 * w // 4, 2 * h // 3), min(h, w) // 5, (20, 40, 200), -1)
+    cv2.line(img, (0, h - 1), (w - 1, 0), (0, 0, 0), 2)
+    return img
+
+
+def synthetic_inputs():
+    low_contrast = cv2.convertScaleAbs(pattern(64, 96), alpha=0.4, beta=60)
+    return {"pattern": pattern(72, 96), "low_contrast": low_contrast}
+
+
+def bundled_inputs():
+    inputs = {}
+    for name in sorted(os.listdir(IMAGE_DIR)):
+        img = cv2.imdecode(np.fromfile(os.path.join(IMAGE_DIR, name), dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is not None:
+            inputs[name] = img
+    return inputs
+
+
+# Fixture membuat array baru tiap test, jadi test boleh menulis ke input-nya
+@pytest.fixture
+def synthetic_images():
+    return synthetic_inputs()
+
+
+@pytest.fixture
+def pattern_image(synthetic_images):
+    return synthetic_images["pattern"]
+
+
+@pytest.fixture
+def photo():
+    """First bundled image"""
+    return next(iter(bundled_inputs().values()))
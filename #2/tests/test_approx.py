@@ -0,0 +1,61 @@
+"""Draft quality mode: close to the exact filters and much faster where it matters."""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import approx
+from operations import apply_operation
+
+
+def _resized(img, side=1024):
+    return cv2.resize(img, (side, side), interpolation=cv2.INTER_CUBIC)
+
+
+@pytest.mark.parametrize("params", [
+    {"blur_type": "Bilateral Filter", "diameter": 25, "sigma": 75},
+    {"blur_type": "Median Blur", "kernel_size": 15},
+])
+def test_draft_is_close_to_final(params, photo):
+    img = _resized(photo)
+    draft = apply_operation(img, "Blurring/Smoothing", params, quality="draft")
+    final = apply_operation(img, "Blurring/Smoothing", params)
+    stats = approx.error_stats(draft, final)
+    assert draft.shape == final.shape and draft.dtype == final.dtype
+    assert stats["psnr"] > 30 and stats["mean_abs"] < 3, stats
+
+
+def test_draft_falls_back_to_exact_when_it_would_not_help(pattern_image, photo):
+    img = pattern_image  # terlalu kecil untuk didownsample
+    params = {"blur_type": "Bilateral Filter", "diameter": 25, "sigma": 75}
+    assert np.array_equal(apply_operation(img, "Blurring/Smoothing", params, quality="draft"),
+                          apply_operation(img, "Blurring/Smoothing", params))
+    big = _resized(photo, 512)
+    assert np.array_equal(approx.median(big, 5, approx.DRAFT), cv2.medianBlur(big, 5))
+
+
+def test_other_operations_ignore_quality(pattern_image):
+    img = pattern_image
+    params = {"blur_type": "Gaussian Blur", "kernel_size": 9}
+    assert np.array_equal(apply_operation(img, "Blurring/Smoothing", params, quality="draft"),
+                          apply_operation(img, "Blurring/Smoothing", params))
+
+
+@pytest.mark.speed
+@pytest.mark.skipif(os.environ.get("SKIP_SPEED_GATE") == "1", reason="SKIP_SPEED_GATE=1")
+def test_draft_bilateral_is_faster(photo):
+    img = _resized(photo)
+    run = lambda i, q: approx.bilateral(i, 25, 75, 75, q)
+    run(img, approx.DRAFT)  # warm-up
+    _, _, report = approx.compare_quality(run, img)
+    assert report["speedup"] > 3, approx.format_report(report)
+
+
+def test_compare_quality_on_a_sample_crop(photo):
+    img = _resized(photo, 1500)
+    run = lambda i, q: approx.median(i, 15, q)
+    draft, final, report = approx.compare_quality(run, img, sample_side=600)
+    assert draft.shape == final.shape == (600, 600, 3) and report["sample"] == (600, 600)
+    assert np.array_equal(final, cv2.medianBlur(approx.sample_crop(img, 600), 15))
+    assert "600x600 crop" in approx.format_report(report)
@@ -0,0 +1,87 @@
+"""ColorImage: each colour conversion runs at most once per image version."""
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from colorimage import ColorImage
+from operations import OPERATIONS
+from workingset import WorkingSet
+
+
+@pytest.mark.parametrize("space,code", [
+    ("GRAY", cv2.COLOR_BGR2GRAY), ("RGB", cv2.COLOR_BGR2RGB),
+    ("HSV", cv2.COLOR_BGR2HSV), ("YCrCb", cv2.COLOR_BGR2YCrCb),
+])
+def test_conversion_matches_cvtcolor_and_is_cached(space, code, pattern_image):
+    bgr = pattern_image
+    img = ColorImage(bgr)
+    first = img.get(space)
+    assert np.array_equal(first, cv2.cvtColor(bgr, code))
+    assert img.get(space) is first and img.conversions == 1
+    assert not first.flags.writeable
+
+
+def test_luminance_reuses_ycrcb(pattern_image):
+    img = ColorImage(pattern_image)
+    assert np.array_equal(img.luminance, img.ycrcb[:, :, 0])
+    assert img.conversions == 1
+
+
+def test_gray_source(pattern_image):
+    gray = pattern_image[:, :, 1].copy()
+    img = ColorImage(gray)
+    assert img.space == "GRAY" and img.gray is img.data
+    assert img.rgb.shape == gray.shape + (3,)
+    assert img.channel_histograms().shape == (1, 256)
+
+
+def test_operations_share_one_gray_conversion(pattern_image):
+    img = ColorImage(pattern_image)
+    for method, params in [("Threshold (Binary)", {"threshold_type": "Otsu"}), ("Edge Detection", {}),
+                           ("Erosion", {}), ("Grayscale", {})]:
+        OPERATIONS.get(method).run(img, params)
+    assert img.conversions == 1
+    assert np.array_equal(img.histogram(), np.bincount(img.gray.ravel(), minlength=256))
+
+
+def test_apply_tags_output_space(pattern_image):
+    img = ColorImage(pattern_image)
+    assert OPERATIONS.get("Grayscale").apply(img).space == "GRAY"
+    assert OPERATIONS.get("Image Negative").apply(img).space == "BGR"
+
+
+def test_concurrent_jobs_convert_once(tmp_path, photo):
+    store = WorkingSet(str(tmp_path), min_bytes=0)
+    img = ColorImage(cv2.resize(photo, (2048, 2048)), store=store, key="orig")
+    otsu = OPERATIONS.get("Threshold (Binary)")
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: otsu.run(img, {"threshold_type": "Otsu"}), range(4)))
+    assert img.conversions == 1 and store.keys() == ["orig_GRAY"]
+    assert all(np.array_equal(r, results[0]) for r in results)
+    # Setelah release, job yang terlambat tidak menulis lagi ke store
+    img.release()
+    assert img.get("HSV") is not None and store.keys() == []
+    store.close()
+
+
+def test_wrapping_leaves_caller_array_writable(pattern_image):
+    bgr = pattern_image
+    OPERATIONS.get("Image Negative").run(bgr, {})
+    img = ColorImage(bgr)
+    assert bgr.flags.writeable and not img.data.flags.writeable
+    bgr[0, 0] = 1
+    # Array yang sudah read-only (mis. dari WorkingSet) dipakai apa adanya
+    frozen = img.data
+    assert ColorImage(frozen).data is frozen
+
+
+def test_difference_stats_reuse_cached_gray(pattern_image):
+    from compare import difference_stats  # butuh PySide6
+
+    img = ColorImage(pattern_image)
+    gray = OPERATIONS.get("Erosion").run(img, {})
+    stats = difference_stats(img, gray)
+    assert img.conversions == 1
+    assert stats == difference_stats(cv2.cvtColor(img.data, cv2.COLOR_BGR2GRAY), gray)
@@ -0,0 +1,93 @@
+"""Dataset statistics: sharded runs merge exactly, aggregates round-trip, rows are written."""
+import argparse
+import csv
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from dataset_stats import StatsAccumulator, image_stats, iter_images, parse_shard, run
+
+
+@pytest.fixture
+def dataset(tmp_path, synthetic_images, photo):
+    """Small tree with images in subfolders, a gray image and one corrupt file"""
+    root = tmp_path / "data"
+    (root / "a" / "deep").mkdir(parents=True)
+    (root / "b").mkdir()
+    images = {
+        "a/one.png": synthetic_images["pattern"],
+        "a/deep/two.png": synthetic_images["low_contrast"],
+        "b/three.png": cv2.resize(photo, (120, 80)),
+        "b/gray.png": cv2.cvtColor(synthetic_images["pattern"], cv2.COLOR_BGR2GRAY),
+        "four.bmp": synthetic_images["pattern"][::-1].copy(),
+    }
+    for name, img in images.items():
+        cv2.imwrite(str(root / name), img)
+    (root / "b" / "broken.png").write_bytes(b"not an image")
+    (root / "notes.txt").write_text("ignored")
+    return str(root), images
+
+
+def _same(a, b):
+    assert a.summary() == pytest.approx(b.summary())
+    assert np.array_equal(a.hist, b.hist) and np.array_equal(a.hist_bgr, b.hist_bgr)
+
+
+def test_iter_images_shards_partition_the_files(dataset):
+    root, images = dataset
+    paths = list(iter_images(root))
+    assert len(paths) == len(images) + 1 and paths == sorted(paths)
+    shards = [list(iter_images(root, (i, 3))) for i in range(3)]
+    assert sorted(p for shard in shards for p in shard) == sorted(paths)
+    assert sum(len(shard) for shard in shards) == len(set(paths))
+
+
+def test_sharded_runs_merge_to_the_single_run(dataset):
+    root, images = dataset
+    single = run(root, workers=1, chunk_size=2)
+    assert single.images == len(images) and single.failed == 1
+    merged = StatsAccumulator()
+    for i in range(3):
+        merged.merge(run(root, workers=2, chunk_size=1, shard=(i, 3)))
+    _same(merged, single)
+    # Sama dengan menjumlah statistik per gambar langsung
+    expected = StatsAccumulator()
+    for img in images.values():
+        expected.add(image_stats(img))
+    assert np.array_equal(single.hist, expected.hist)
+    assert single.pixels == sum(img.shape[0] * img.shape[1] for img in images.values())
+
+
+def test_aggregate_save_load_round_trip(dataset, tmp_path):
+    root, _ = dataset
+    total = run(root, workers=1)
+    path = str(tmp_path / "agg.npz")
+    total.save(path)
+    loaded = StatsAccumulator.load(path)
+    _same(loaded, total)
+    assert loaded.failed == total.failed and isinstance(loaded.images, int)
+
+
+def test_csv_rows(dataset, tmp_path):
+    root, images = dataset
+    out = str(tmp_path / "stats.csv")
+    run(root, out=out, workers=1, chunk_size=2)
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = {os.path.relpath(r["path"], root).replace(os.sep, "/"): r for r in csv.DictReader(f)}
+    assert set(rows) == set(images)  # file rusak dihitung failed, tanpa baris
+    row = rows["b/gray.png"]
+    gray = images["b/gray.png"]
+    stats = image_stats(gray)
+    assert (int(row["width"]), int(row["height"]), int(row["channels"])) == (gray.shape[1], gray.shape[0], 1)
+    assert float(row["mean"]) == pytest.approx(stats["mean"])
+    assert float(row["edge_density"]) == pytest.approx(stats["edge_density"])
+    assert np.array_equal(np.array(row["hist"].split(), dtype=np.int64), stats["hist"])
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (1, 4)
+    for text in ("4/4", "-1/2"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(text)
@@ -0,0 +1,69 @@
+"""Kernel registry: separable detection, filter paths, file loading and caching."""
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from kernels import Kernel, KernelRegistry, box_kernel, load_kernel_matrix, sharpen_kernel
+
+
+def _gaussian(ksize, sigma):
+    g = cv2.getGaussianKernel(ksize, sigma)
+    return g @ g.T
+
+
+@pytest.mark.parametrize("matrix,separable", [
+    (_gaussian(7, 1.5), True),
+    (box_kernel(5), True),
+    (np.ones((1, 9)) / 9, True),
+    (sharpen_kernel(1.0), False),
+    (np.random.default_rng(0).standard_normal((9, 9)), False),
+])
+def test_separable_detection(matrix, separable):
+    kernel = Kernel("k", matrix)
+    assert kernel.separable == separable
+    if separable:
+        assert np.allclose(kernel.column @ kernel.row, kernel.matrix, atol=1e-6)
+
+
+@pytest.mark.parametrize("matrix", [
+    _gaussian(9, 2.0),                                              # sepFilter2D
+    box_kernel(15),                                                 # sepFilter2D, kernel besar
+    np.random.default_rng(1).standard_normal((31, 31)) / 31 + 1 / 961,  # dense besar
+])
+def test_apply_matches_filter2d(pattern_image, matrix):
+    kernel = Kernel("k", matrix)
+    expected = cv2.filter2D(pattern_image, -1, kernel.matrix)
+    assert int(cv2.absdiff(kernel.apply(pattern_image), expected).max()) <= 1
+
+
+def test_load_kernel_matrix_formats(tmp_path):
+    expected = np.array([[1, 2, 3], [4, 5, 6]], np.float32)
+    (tmp_path / "k.txt").write_text("# komentar\n1 2 3\n\n  # baris kosong diabaikan\n4 5 6\n")
+    (tmp_path / "k.csv").write_text("1,2,3\n4, 5, 6\n")
+    (tmp_path / "k.json").write_text(json.dumps(expected.tolist()))
+    np.save(tmp_path / "k.npy", expected)
+    for ext in ("txt", "csv", "json", "npy"):
+        assert np.array_equal(load_kernel_matrix(str(tmp_path / f"k.{ext}")), expected), ext
+    (tmp_path / "row.txt").write_text("1 2 1\n")
+    assert load_kernel_matrix(str(tmp_path / "row.txt")).shape == (1, 3)
+
+
+def test_registry_caches_and_invalidates(tmp_path):
+    registry = KernelRegistry()
+    registry.register("Sharpen", sharpen_kernel)
+    first = registry.get("Sharpen", strength=1.5)
+    assert registry.get("Sharpen", strength=1.5) is first
+    assert registry.get("Sharpen", strength=2.0) is not first
+    # Mendaftar ulang nama yang sama membuang kernel lama dari cache
+    registry.register("Sharpen", sharpen_kernel)
+    assert registry.get("Sharpen", strength=1.5) is not first
+    with pytest.raises(KeyError):
+        registry.get("Missing")
+
+    (tmp_path / "edge.txt").write_text("-1 -1 -1\n-1 8 -1\n-1 -1 -1\n")
+    name = registry.load_file(str(tmp_path / "edge.txt"))
+    assert name == "edge" and name in registry.names()
+    assert registry.get(name) is registry.get(name) and not registry.get(name).separable
+    assert registry.structuring_element(size=5) is registry.structuring_element(size=5)
@@ -0,0 +1,74 @@
+"""Operation registry: declared LUTs and hints must agree with the real operations."""
+import cv2
+import numpy as np
+import pytest
+
+from operations import OPERATIONS, apply_operation, compose_luts
+from registry import Operation, OperationRegistry, Param
+
+
+def test_every_operation_runs_with_defaults(pattern_image):
+    img = pattern_image
+    for op in OPERATIONS:
+        out = op.run(img)
+        expected_ndim = 2 if op.hints()["output_space"] == "GRAY" else 3
+        assert out.ndim == expected_ndim, op.name
+
+
+@pytest.mark.parametrize("method,params", [
+    ("Image Negative", {}),
+    ("Brightness/Contrast Adjustment", {"brightness": -35, "contrast": 1.7}),
+])
+def test_lut_matches_operation(method, params, pattern_image):
+    img = pattern_image
+    lut = OPERATIONS.get(method).lut_for(params)
+    assert np.array_equal(cv2.LUT(img, lut), apply_operation(img, method, params))
+
+
+def test_compose_luts_matches_chained_operations(synthetic_images):
+    img = synthetic_images["low_contrast"]
+    chain = [("Brightness/Contrast Adjustment", {"brightness": 20, "contrast": 1.3}), ("Image Negative", {})]
+    expected = img
+    for method, params in chain:
+        expected = apply_operation(expected, method, params)
+    lut = compose_luts(OPERATIONS.get(m).lut_for(p) for m, p in chain)
+    assert np.array_equal(cv2.LUT(img, lut), expected)
+
+
+def test_variant_hints():
+    thresh = OPERATIONS.get("Threshold (Binary)")
+    assert thresh.hints({"threshold_type": "Otsu"})["tileable"] is False
+    assert thresh.hints({"threshold_type": "Adaptive Mean", "block_size": 21})["halo"] == 10
+    blur = OPERATIONS.get("Blurring/Smoothing")
+    assert blur.hints({"blur_type": "Bilateral Filter", "diameter": 15})["halo"] == 7
+
+
+def test_otsu_feedback(pattern_image):
+    feedback = {}
+    apply_operation(pattern_image, "Threshold (Binary)", {"threshold_type": "Otsu"}, feedback=feedback)
+    assert 0 < feedback["threshold"] < 255
+
+
+def test_params_are_coerced_and_clamped():
+    op = Operation("Test", lambda img, p, ctx: p, params=[Param("n", "N:", int, 3, 1, 9)])
+    img = np.zeros((4, 4, 3), np.uint8)
+    assert op.run(img, {"n": "40"}) == {"n": 9}
+    assert op.run(img, {"other": 1}) == {"n": 3}
+
+
+def test_plugin_callable_registers(monkeypatch):
+    registry = OperationRegistry()
+
+    class EntryPoint:
+        name = "demo"
+
+        def load(self):
+            return lambda reg: reg.register(Operation("Demo", lambda img, p, ctx: img))
+
+    class EntryPoints(list):
+        def select(self, group):
+            return self
+
+    monkeypatch.setattr("registry.metadata.entry_points", lambda: EntryPoints([EntryPoint()]))
+    registry.load_plugins()
+    assert "Demo" in registry
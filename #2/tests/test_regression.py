@@ -0,0 +1,211 @@
+"""Golden-output and speed regression tests for every processing method.
+
+Each case runs apply_operation with representative parameters over
+deterministic synthetic images and the bundled images in image/.
+Synthetic outputs are compared pixel-wise against tests/golden/synthetic.npz
+(exact, or within the method's tolerance); bundled outputs against a SHA-256
+plus a histogram fingerprint in tests/golden/bundled.json. Each case also
+has a time budget on a 2048x2048 image in tests/golden/budgets.json.
+
+After an intentional output change, or on new reference hardware:
+
+    python tests/test_regression.py --update-golden
+    python tests/test_regression.py --update-budgets
+
+SPEED_SLACK=1.5 loosens the budgets; SKIP_SPEED_GATE=1 skips them.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import bundled_inputs, pattern, synthetic_inputs
+from operations import apply_operation
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(HERE, "golden")
+SYNTHETIC_GOLDEN = os.path.join(GOLDEN_DIR, "synthetic.npz")
+BUNDLED_GOLDEN = os.path.join(GOLDEN_DIR, "bundled.json")
+BUDGETS = os.path.join(GOLDEN_DIR, "budgets.json")
+
+CASES = [
+    ("Image Negative", {}),
+    ("Grayscale", {}),
+    ("Histogram Equalization", {"eq_type": "Global"}),
+    ("Histogram Equalization", {"eq_type": "CLAHE", "clip_limit": 2.0, "tile_grid": 8}),
+    ("Histogram Equalization", {"eq_type": "Global (Color)"}),
+    ("Histogram Equalization", {"eq_type": "CLAHE (Color)", "clip_limit": 3.0, "tile_grid": 4}),
+    ("Threshold (Binary)", {"threshold_type": "Fixed", "threshold": 127}),
+    ("Threshold (Binary)", {"threshold_type": "Otsu"}),
+    ("Threshold (Binary)", {"threshold_type": "Adaptive Mean", "block_size": 11, "c": 2}),
+    ("Threshold (Binary)", {"threshold_type": "Adaptive Gaussian", "block_size": 15, "c": 3}),
+    ("Blurring/Smoothing", {"blur_type": "Gaussian Blur", "kernel_size": 5}),
+    ("Blurring/Smoothing", {"blur_type": "Median Blur", "kernel_size": 5}),
+    ("Blurring/Smoothing", {"blur_type": "Mean Blur", "kernel_size": 4}),
+    ("Blurring/Smoothing", {"blur_type": "Bilateral Filter", "diameter": 9, "sigma": 75}),
+    ("Edge Detection", {"edge_type": "Canny", "canny_threshold1": 100, "canny_threshold2": 200}),
+    ("Edge Detection", {"edge_type": "Sobel", "sobel_ksize": 3}),
+    ("Edge Detection", {"edge_type": "Laplacian"}),
+    ("Morphology (Open)", {}),
+    ("Morphology (Close)", {}),
+    ("Dilation", {}),
+    ("Erosion", {}),
+    ("Brightness/Contrast Adjustment", {"brightness": 20, "contrast": 1.3}),
+    ("Sharpen / Contrast", {"sharpen_kernel": "Sharpen", "sharpen_factor": 100}),
+    ("Sharpen / Contrast", {"sharpen_kernel": "Sharpen", "sharpen_factor": 250}),
+    ("Sharpen / Contrast", {"sharpen_kernel": "Unsharp Mask", "sharpen_factor": 150}),
+    ("Sharpen / Contrast", {"sharpen_kernel": "Emboss", "sharpen_factor": 100}),
+]
+
+# (max abs difference, max fraction of differing pixels) yang masih diterima.
+# Metode integer/LUT harus identik; metode float boleh beda pembulatan.
+TOLERANCES = {
+    "Blurring/Smoothing": (1, 0.01),
+    "Edge Detection": (1, 0.01),
+    "Histogram Equalization": (1, 0.01),
+    "Sharpen / Contrast": (1, 0.01),
+}
+EXACT = (0, 0.0)
+
+
+def case_id(method, params):
+    args = ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{method}[{args}]"
+
+
+def fingerprint(img):
+    hist = np.bincount(img.ravel(), minlength=256).astype(np.float64)
+    return {
+        "shape": list(img.shape),
+        "dtype": str(img.dtype),
+        "sha256": hashlib.sha256(np.ascontiguousarray(img).tobytes()).hexdigest(),
+        "mean": float(img.mean()),
+        "hist64": (hist.reshape(64, 4).sum(axis=1) / img.size).round(6).tolist(),
+    }
+
+
+def assert_close(result, expected, tolerance):
+    assert result.shape == expected.shape and result.dtype == expected.dtype
+    max_abs, max_fraction = tolerance
+    diff = cv2.absdiff(result, expected)
+    fraction = np.count_nonzero(diff) / diff.size
+    assert int(diff.max()) <= max_abs and fraction <= max_fraction, \
+        f"max abs diff {int(diff.max())}, {fraction:.2%} of values differ (allowed {max_abs}, {max_fraction:.2%})"
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def synthetic_golden():
+    with np.load(SYNTHETIC_GOLDEN) as data:
+        return {k: data[k] for k in data.files}
+
+
+@pytest.fixture(scope="module")
+def bundled_golden():
+    return _load_json(BUNDLED_GOLDEN)
+
+
+@pytest.mark.parametrize("input_name", sorted(synthetic_inputs()))
+@pytest.mark.parametrize("method,params", CASES, ids=[case_id(*c) for c in CASES])
+def test_synthetic_golden(method, params, input_name, synthetic_golden):
+    img = synthetic_inputs()[input_name]
+    result = apply_operation(img, method, params)
+    key = f"{input_name}/{case_id(method, params)}"
+    assert key in synthetic_golden, f"no golden output for {key}; run --update-golden"
+    assert_close(result, synthetic_golden[key], TOLERANCES.get(method, EXACT))
+
+
+@pytest.mark.parametrize("method,params", CASES, ids=[case_id(*c) for c in CASES])
+def test_bundled_golden(method, params, bundled_golden):
+    for name, img in bundled_inputs().items():
+        key = f"{name}/{case_id(method, params)}"
+        expected = bundled_golden[key]
+        got = fingerprint(apply_operation(img, method, params))
+        assert got["shape"] == expected["shape"] and got["dtype"] == expected["dtype"], key
+        if got["sha256"] == expected["sha256"]:
+            continue
+        max_abs, max_fraction = TOLERANCES.get(method, EXACT)
+        assert max_abs > 0, f"{key}: output changed (hash mismatch) for an exact method"
+        # Tanpa gambar golden lengkap, cek sidik jari statistiknya
+        assert abs(got["mean"] - expected["mean"]) <= max_abs * max_fraction + 1e-6, key
+        l1 = np.abs(np.array(got["hist64"]) - np.array(expected["hist64"])).sum()
+        assert l1 <= 2 * max_fraction, f"{key}: histogram moved by {l1:.4f}"
+
+
+def speed_input():
+    return pattern(2048, 2048)
+
+
+def time_case(img, method, params, repeats=3):
+    apply_operation(img, method, params)  # warm-up (cache kernel, thread pool)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        apply_operation(img, method, params)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+@pytest.mark.speed
+@pytest.mark.skipif(os.environ.get("SKIP_SPEED_GATE") == "1", reason="SKIP_SPEED_GATE=1")
+@pytest.mark.parametrize("method,params", CASES, ids=[case_id(*c) for c in CASES])
+def test_speed_budget(method, params):
+    budgets = _load_json(BUDGETS)
+    key = case_id(method, params)
+    assert key in budgets, f"no time budget for {key}; run --update-budgets"
+    slack = float(os.environ.get("SPEED_SLACK", "1.0"))
+    elapsed = time_case(speed_input(), method, params)
+    assert elapsed <= budgets[key] * slack, f"{key} took {elapsed * 1000:.1f} ms, budget {budgets[key] * 1000:.1f} ms"
+
+
+def update_golden():
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    arrays = {}
+    for input_name, img in synthetic_inputs().items():
+        for method, params in CASES:
+            arrays[f"{input_name}/{case_id(method, params)}"] = apply_operation(img, method, params)
+    np.savez_compressed(SYNTHETIC_GOLDEN, **arrays)
+    bundled = {}
+    for name, img in bundled_inputs().items():
+        for method, params in CASES:
+            bundled[f"{name}/{case_id(method, params)}"] = fingerprint(apply_operation(img, method, params))
+    with open(BUNDLED_GOLDEN, "w", encoding="utf-8") as f:
+        json.dump(bundled, f, indent=1, sort_keys=True)
+    print(f"wrote {len(arrays)} synthetic and {len(bundled)} bundled golden outputs")
+
+
+def update_budgets(headroom=3.0, floor=0.05):
+    """Record budget = max(median time * headroom, floor) seconds per case"""
+    img = speed_input()
+    budgets = {}
+    for method, params in CASES:
+        elapsed = time_case(img, method, params)
+        budgets[case_id(method, params)] = round(max(elapsed * headroom, floor), 4)
+        print(f"{case_id(method, params)}: {elapsed * 1000:.1f} ms")
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    with open(BUDGETS, "w", encoding="utf-8") as f:
+        json.dump(budgets, f, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-golden", action="store_true")
+    parser.add_argument("--update-budgets", action="store_true")
+    args = parser.parse_args()
+    if args.update_golden:
+        update_golden()
+    if args.update_budgets:
+        update_budgets()
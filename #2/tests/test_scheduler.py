@@ -0,0 +1,109 @@
+"""Job scheduler: priority classes, RAM admission, fair batches and queue stats."""
+import threading
+
+import numpy as np
+
+import tiling
+from operations import OPERATIONS
+from scheduler import BATCH, INTERACTIVE, JobScheduler, estimate_memory
+
+
+def _blocked(scheduler, **kwargs):
+    """Occupy a worker until the returned event is set"""
+    gate = threading.Event()
+    return gate, scheduler.submit(gate.wait, **kwargs)
+
+
+def test_interactive_jobs_jump_the_queue():
+    scheduler = JobScheduler(workers=1, ram_budget=1 << 30, interactive_reserve=0)
+    order = []
+    gate, first = _blocked(scheduler)
+    batch = [scheduler.submit(order.append, f"b{i}", batch="a") for i in range(2)]
+    interactive = scheduler.submit(order.append, "i", priority=INTERACTIVE)
+    stats = scheduler.stats()
+    assert stats["queued"] == {"interactive": 1, "batch": 2}
+    assert stats["running"] == {"interactive": 0, "batch": 1}
+    gate.set()
+    for future in [first, interactive] + batch:
+        future.result(timeout=5)
+    assert order == ["i", "b0", "b1"]
+    assert scheduler.stats()["completed"] == 4
+    scheduler.shutdown()
+
+
+def test_batches_share_round_robin():
+    scheduler = JobScheduler(workers=1, ram_budget=1 << 30)
+    order = []
+    gate, first = _blocked(scheduler, batch="big")
+    futures = [scheduler.submit(order.append, f"big{i}", batch="big") for i in range(3)]
+    futures += [scheduler.submit(order.append, f"small{i}", batch="small") for i in range(2)]
+    assert scheduler.stats()["batches"] == 2
+    gate.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["big0", "small0", "big1", "small1", "big2"]
+    scheduler.shutdown()
+
+
+def test_admission_respects_ram_budget():
+    scheduler = JobScheduler(workers=4, ram_budget=100, interactive_reserve=0)
+    gate, first = _blocked(scheduler, memory=80)
+    second = scheduler.submit(lambda: "done", memory=40)
+    # Masih ada worker kosong, tetapi 80 + 40 melebihi budget
+    assert not second.running() and scheduler.stats()["memory"] == 80
+    gate.set()
+    assert second.result(timeout=5) == "done"
+    # Job yang sendirian melebihi budget tetap jalan bila tidak ada job lain
+    assert scheduler.submit(lambda: "huge", memory=1000).result(timeout=5) == "huge"
+    assert scheduler.stats()["memory"] == 0
+    scheduler.shutdown()
+
+
+def test_reserve_keeps_a_thread_for_interactive_jobs():
+    # Juga dengan satu core: batch yang lama tidak boleh menahan apply
+    scheduler = JobScheduler(workers=1, ram_budget=1 << 30, interactive_reserve=1)
+    gate, first = _blocked(scheduler, batch="a")
+    waiting = scheduler.submit(lambda: None, batch="a")
+    assert scheduler.stats()["running"]["batch"] == 1 and not waiting.running()
+    assert scheduler.submit(lambda: "now", priority=INTERACTIVE).result(timeout=5) == "now"
+    assert scheduler.cancel_batch("a") == 1 and waiting.cancelled()
+    gate.set()
+    first.result(timeout=5)
+    wait = scheduler.stats()["wait"]
+    assert wait["interactive"]["max"] >= 0 and wait["batch"]["oldest"] == 0
+    scheduler.shutdown()
+
+
+def test_errors_are_delivered_and_release_memory():
+    scheduler = JobScheduler(workers=1, ram_budget=100)
+    future = scheduler.submit(lambda: 1 / 0, priority=BATCH, memory=50)
+    assert isinstance(future.exception(timeout=5), ZeroDivisionError)
+    assert scheduler.stats()["memory"] == 0
+    scheduler.shutdown()
+
+
+def test_memory_estimate_follows_size_and_operation():
+    shape = (1000, 2000, 3)
+    negative = OPERATIONS.get("Image Negative")
+    edges = OPERATIONS.get("Edge Detection")
+    blur = OPERATIONS.get("Blurring/Smoothing")
+    assert estimate_memory(negative, shape) == 3 * 2_000_000
+    assert estimate_memory(negative, (2000, 2000, 3)) == 2 * estimate_memory(negative, shape)
+    assert estimate_memory(edges, shape, {"edge_type": "Sobel"}) > estimate_memory(edges, shape, {"edge_type": "Canny"})
+    bilateral = {"blur_type": "Bilateral Filter"}
+    assert estimate_memory(blur, shape, bilateral, "draft") > estimate_memory(blur, shape, bilateral)
+    # Estimasi Sobel mencakup buffer float64 yang benar-benar dialokasikan
+    img = np.zeros(shape[:2], np.uint8)
+    assert estimate_memory(edges, shape, {"edge_type": "Sobel"}) >= 2 * img.astype(np.float64).nbytes
+
+
+def test_batch_jobs_get_a_strip_budget(monkeypatch):
+    monkeypatch.setattr(tiling, "DEFAULT_WORKERS", 4)
+    scheduler = JobScheduler(workers=2, ram_budget=1 << 30, batch_threads=2)
+    big = np.zeros((2000, 1000), np.uint8)
+    assert scheduler.submit(tiling.strip_count, big).result(timeout=5) == 2
+    assert scheduler.submit(tiling.strip_count, big, priority=INTERACTIVE).result(timeout=5) == 4
+    with tiling.limit_workers(1):
+        assert tiling.worker_limit() == 1
+    assert tiling.worker_limit() == 4 and scheduler.stats()["batch_threads"] == 2
+    scheduler.shutdown()
@@ -0,0 +1,82 @@
+"""Session manifests: replay must reproduce what the GUI applied."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import tiling
+from operations import apply_operation
+from scheduler import JobScheduler
+from session import SessionRecorder, load_manifest, replay
+
+
+def test_recorder_keeps_history_and_current_pipeline(tmp_path):
+    path = tmp_path / "session.json"
+    rec = SessionRecorder(str(path))
+    rec.record("Image Negative", {})
+    rec.record("Blurring/Smoothing", {"blur_type": "Median Blur", "kernel_size": 5}, feedback={})
+    manifest = json.loads(path.read_text())
+    assert [h["method"] for h in manifest["history"]] == ["Image Negative", "Blurring/Smoothing"]
+    # Parameter lengkap (termasuk default) dicatat supaya replay tidak tergantung default
+    assert manifest["pipeline"] == [{"method": "Blurring/Smoothing", "params": {
+        "blur_type": "Median Blur", "kernel_size": 5, "diameter": 9, "sigma": 75}}]
+    rec.reset()
+    assert load_manifest(str(path))["pipeline"] == []
+
+
+def test_replay_matches_interactive_result(tmp_path, synthetic_images):
+    src, out = tmp_path / "in", tmp_path / "out"
+    (src / "sub").mkdir(parents=True)
+    inputs = synthetic_images
+    for name, img in inputs.items():
+        cv2.imwrite(str(src / f"{name}.png"), img)
+        cv2.imwrite(str(src / "sub" / f"{name}.png"), img)
+    (src / "broken.png").write_bytes(b"not an image")
+
+    params = {"threshold_type": "Adaptive Gaussian", "block_size": 15, "c": 3}
+    rec = SessionRecorder()
+    rec.record("Threshold (Binary)", params)
+    done, skipped, failed = replay(rec.manifest(), str(src), str(out), workers=2, chunk_size=1)
+    assert (done, skipped, len(failed)) == (4, 0, 1)
+    for name, img in inputs.items():
+        expected = apply_operation(img, "Threshold (Binary)", params)
+        for rel in (f"{name}.png", f"sub/{name}.png"):
+            assert np.array_equal(cv2.imread(str(out / rel), cv2.IMREAD_GRAYSCALE), expected)
+
+    done, skipped, _ = replay(rec.manifest(), str(src), str(out), workers=1, skip_existing=True)
+    assert (done, skipped) == (0, 4)
+
+
+def test_replay_after_parent_used_tile_pool(tmp_path, monkeypatch, photo):
+    # Worker hasil fork mewarisi thread pool tiling tanpa thread-nya; replay dulu hang di sini
+    monkeypatch.setattr(tiling, "DEFAULT_WORKERS", 2)
+    img = photo
+    params = {"eq_type": "CLAHE", "clip_limit": 2.0, "tile_grid": 8}
+    expected = apply_operation(img, "Histogram Equalization", params)
+    assert tiling._executor is not None
+    (tmp_path / "in").mkdir()
+    cv2.imwrite(str(tmp_path / "in" / "a.png"), img)
+    rec = SessionRecorder()
+    rec.record("Histogram Equalization", params)
+    with ThreadPoolExecutor(1) as runner:
+        future = runner.submit(replay, rec.manifest(), str(tmp_path / "in"), str(tmp_path / "out"), workers=2)
+        assert future.result(timeout=60) == (1, 0, [])
+    assert np.array_equal(cv2.imread(str(tmp_path / "out" / "a.png"), cv2.IMREAD_GRAYSCALE), expected)
+
+
+def test_scheduled_replay_matches_process_replay(tmp_path, synthetic_images):
+    src = tmp_path / "in"
+    src.mkdir()
+    for i, img in enumerate(list(synthetic_images.values()) * 3):
+        cv2.imwrite(str(src / f"{i}.png"), img)
+    rec = SessionRecorder()
+    rec.record("Blurring/Smoothing", {"blur_type": "Median Blur", "kernel_size": 5})
+    scheduler = JobScheduler(workers=2, ram_budget=1 << 30)
+    assert replay(rec.manifest(), str(src), str(tmp_path / "threads"), chunk_size=2, scheduler=scheduler) == (6, 0, [])
+    scheduler.shutdown()
+    assert scheduler.stats()["completed"] == 3 and scheduler.stats()["memory"] == 0
+    replay(rec.manifest(), str(src), str(tmp_path / "procs"), workers=2)
+    for i in range(6):
+        assert np.array_equal(cv2.imread(str(tmp_path / "threads" / f"{i}.png")),
+                              cv2.imread(str(tmp_path / "procs" / f"{i}.png")))
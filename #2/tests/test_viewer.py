@@ -0,0 +1,68 @@
+"""Pyramid viewer: level selection, tile LRU and visible tile ranges (no display needed)."""
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6")
+
+from viewer import TILE_SIZE, ImagePyramid, TileCache, visible_tiles
+
+
+def test_pyramid_levels_on_odd_sizes():
+    pyramid = ImagePyramid(np.zeros((1001, 3001, 3), np.uint8))
+    assert pyramid.max_level() == 3  # 3001 / 256 = 11.7 -> 2^3
+    # pyrDown membulatkan ke atas: 3001 -> 1501 -> 751 -> 376
+    assert [pyramid.level(n).shape[:2] for n in range(4)] == [(1001, 3001), (501, 1501), (251, 751), (126, 376)]
+    assert pyramid.level(10) is pyramid.level(3)
+    assert pyramid.proxy_level(3001) == 0
+    assert pyramid.proxy_level(1500) == 2 and pyramid.proxy(1500).shape[1] == 751
+    assert pyramid.proxy_level(10) == 3  # tidak ada yang cukup kecil: level paling kasar
+    small = ImagePyramid(np.zeros((255, 99), np.uint8))
+    assert small.max_level() == 0 and small.proxy_level(10) == 0
+    assert ImagePyramid(np.zeros((513, 257), np.uint8)).max_level() == 1
+
+
+def test_level_for_zoom():
+    pyramid = ImagePyramid(np.zeros((1001, 3001), np.uint8))
+    assert [pyramid.level_for_zoom(z) for z in (4.0, 1.0, 0.9, 0.5, 0.3, 0.2, 0.01)] == [0, 0, 0, 1, 1, 2, 3]
+
+
+def test_tile_cache_evicts_least_recently_used():
+    cache = TileCache(capacity=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"   # a sekarang paling baru dipakai
+    cache.put("d", "D")
+    assert cache.get("b") is None and [cache.get(k) for k in "acd"] == ["A", "C", "D"]
+    cache.put("c", "C2")           # menimpa juga menyegarkan urutan
+    cache.put("e", "E")
+    assert cache.get("a") is None and cache.get("c") == "C2"
+    cache.clear()
+    assert cache.get("d") is None
+
+
+@pytest.mark.parametrize("lo,hi,offset,scale,length,expected", [
+    # zoom > 1, digeser ke kiri (offset negatif)
+    (0, 800, -1000, 4.0, 3001, [0, 1]),
+    (0, 800, -2000, 4.0, 3001, [1, 2]),
+    (0, 800, -4 * 3001 + 10, 4.0, 3001, [11]),  # hanya tepi kanan gambar yang terlihat
+    (0, 800, -20000, 4.0, 3001, []),            # gambar seluruhnya di kiri viewport
+    # zoom < 1 pada level 2 (751 px, tiap pixel level ~1 px layar)
+    (0, 400, -300, 0.25 * 3001 / 751, 751, [1, 2]),
+    (0, 400, 0, 0.25 * 3001 / 751, 751, [0, 1]),
+    (0, 1000, 50, 0.25 * 3001 / 751, 751, [0, 1, 2]),
+    # gambar di kanan viewport, juga bila jaraknya kurang dari satu pixel
+    (0, 400, 500, 1.0, 1000, []),
+    (0, 400, 400.5, 1.0, 1000, []),
+])
+def test_visible_tiles(lo, hi, offset, scale, length, expected):
+    assert list(visible_tiles(lo, hi, offset, scale, length)) == expected
+
+
+def test_visible_tiles_cover_the_viewport():
+    # Setiap pixel layar yang berada di atas gambar harus jatuh di salah satu tile
+    length, scale, offset = 3001, 2.5, -1234.5
+    tiles = visible_tiles(0, 640, offset, scale, length)
+    for x in np.linspace(0, 640, 101):
+        pixel = int((x - offset) // scale)
+        if 0 <= pixel < length:
+            assert pixel // TILE_SIZE in tiles
@@ -0,0 +1,66 @@
+"""WorkingSet: memory-mapped storage, aliasing and refcounted file removal."""
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from workingset import WorkingSet
+
+
+@pytest.fixture
+def store(tmp_path):
+    ws = WorkingSet(str(tmp_path), min_bytes=1024)
+    yield ws
+    ws.close()
+
+
+def _files(ws):
+    return sorted(os.listdir(ws.dir))
+
+
+def test_large_arrays_are_mapped_and_read_only(store):
+    big = np.arange(64 * 64, dtype=np.uint8).reshape(64, 64)
+    stored = store.put("orig", big)
+    assert isinstance(stored, np.memmap) and np.array_equal(stored, big)
+    assert not stored.flags.writeable and big.flags.writeable
+    small = store.put("small", np.zeros((4, 4), np.uint8))
+    assert not isinstance(small, np.memmap) and not small.flags.writeable
+    assert len(_files(store)) == 1
+    assert store.memory_usage()["mapped"] == big.nbytes
+
+
+def test_alias_shares_storage_and_last_release_removes_file(store):
+    orig = store.put("orig", np.ones((64, 64), np.uint8))
+    assert store.alias("result", "orig") is orig
+    # Menyimpan array yang sama di key lain juga menjadi alias, bukan file baru
+    assert store.put("copy", orig) is orig and len(_files(store)) == 1
+    store.release("orig")
+    store.release("copy")
+    assert _files(store) and store.get("result") is orig
+    store.release("result")
+    assert _files(store) == [] and store.keys() == []
+
+
+def test_replacing_a_key_frees_its_old_file(store):
+    store.put("result", np.ones((64, 64), np.uint8))
+    store.put("result", np.zeros((64, 64), np.uint8))
+    assert len(_files(store)) == 1 and not store.get("result").any()
+    store.put("result", None)
+    assert "result" not in store and _files(store) == []
+
+
+def test_close_and_garbage_collection_remove_scratch_dir(tmp_path):
+    ws = WorkingSet(str(tmp_path), min_bytes=0)
+    ws.put("orig", np.ones((8, 8), np.uint8))
+    ws.close()
+    assert not os.path.exists(ws.dir)
+    # Setelah close, put tetap mengembalikan array tanpa menulis file
+    assert ws.put("late", np.ones((8, 8), np.uint8)).sum() == 64 and "late" not in ws
+
+    ws = WorkingSet(str(tmp_path), min_bytes=0)
+    ws.put("orig", np.ones((8, 8), np.uint8))
+    path = ws.dir
+    del ws
+    gc.collect()
+    assert not os.path.exists(path)
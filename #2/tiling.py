@@ -0,0 +1,100 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+# OpenCV dan operasi numpy besar melepas GIL, jadi thread sudah cukup
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Gambar di bawah ukuran ini diproses langsung tanpa dipecah
+MIN_PARALLEL_PIXELS = 1 << 20
+
+_executor = None
+_limit = threading.local()
+
+
+def get_executor():
+    """Shared thread pool used by every tiled operation"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="tile")
+    return _executor
+
+
+def _forget_executor():
+    # Proses hasil fork (worker ProcessPoolExecutor) mewarisi pool tanpa thread-nya;
+    # submit ke sana tidak akan pernah dijalankan, jadi buat pool baru bila perlu
+    global _executor
+    _executor = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+
+def split_bounds(length, parts):
+    """Split [0, length) into `parts` near-equal (start, stop) ranges"""
+    parts = max(1, min(parts, length))
+    edges = np.linspace(0, length, parts + 1).astype(int)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(parts)]
+
+
+def worker_limit():
+    """Tile fan-out allowed for work started from the calling thread"""
+    return max(1, min(getattr(_limit, "workers", DEFAULT_WORKERS), DEFAULT_WORKERS))
+
+
+@contextmanager
+def limit_workers(workers):
+    """Cap the strips / parallel items of tiled work started from this thread"""
+    previous = getattr(_limit, "workers", None)
+    _limit.workers = workers
+    try:
+        yield
+    finally:
+        if previous is None:
+            del _limit.workers
+        else:
+            _limit.workers = previous
+
+
+def strip_count(img):
+    """Number of strips worth using for an image of this size"""
+    return worker_limit() if img.size >= MIN_PARALLEL_PIXELS else 1
+
+
+def map_parallel(fn, items):
+    """Run fn over items on the shared pool, preserving order"""
+    items = list(items)
+    if len(items) <= 1 or worker_limit() <= 1:
+        return [fn(item) for item in items]
+    return list(get_executor().map(fn, items))
+
+
+def run_strips(fn, img, halo=0, out=None, strips=None):
+    """Apply fn to horizontal strips of img (with `halo` rows of context) in parallel.
+
+    fn receives the padded strip and must return an array with the same number
+    of rows; the halo rows are cropped off before writing into the output.
+    """
+    h = img.shape[0]
+    if strips is None:
+        strips = strip_count(img)
+    bounds = split_bounds(h, strips)
+    if len(bounds) == 1:
+        return fn(img)
+
+    def work(bound):
+        y0, y1 = bound
+        p0, p1 = max(0, y0 - halo), min(h, y1 + halo)
+        res = fn(img[p0:p1])
+        return res[y0 - p0:y0 - p0 + (y1 - y0)]
+
+    parts = map_parallel(work, bounds)
+    if out is None:
+        out = np.empty((h,) + parts[0].shape[1:], dtype=parts[0].dtype)
+    for (y0, y1), part in zip(bounds, parts):
+        out[y0:y1] = part
+    return out
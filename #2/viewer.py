@@ -0,0 +1,280 @@
+import math
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PySide6.QtWidgets import QStyle, QStyleOption, QWidget
+from PySide6.QtCore import Qt, QPointF, QRectF, Signal
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+
+TILE_SIZE = 256
+TILE_CACHE_SIZE = 512  # jumlah tile (QPixmap) yang disimpan per viewer
+MAX_ZOOM = 32.0
+
+
+def qimg_from_cv(img):
+    """Convert an OpenCV image (BGR or gray) to QImage.
+
+    BGR is handed to Qt as Format_BGR888, so previews need no BGR->RGB pass.
+    """
+    if img is None:
+        return None
+    img = np.ascontiguousarray(img)
+    if len(img.shape) == 2:  # grayscale
+        h, w = img.shape
+        bytes_per_line = img.strides[0]
+        return QImage(img.data, w, h, bytes_per_line, QImage.Format_Grayscale8).copy()
+    else:
+        h, w, ch = img.shape
+        bytes_per_line = img.strides[0]
+        return QImage(img.data, w, h, bytes_per_line, QImage.Format_BGR888).copy()
+
+
+class ImagePyramid:
+    """Multi-resolution pyramid (level 0 = full res), levels built lazily by pyrDown"""
+
+    def __init__(self, img, min_size=TILE_SIZE):
+        self.levels = [img]
+        self.min_size = min_size
+
+    @property
+    def shape(self):
+        return self.levels[0].shape
+
+    def max_level(self):
+        h, w = self.shape[:2]
+        return max(0, int(math.floor(math.log2(max(max(h, w) / self.min_size, 1)))))
+
+    def level(self, n):
+        n = min(n, self.max_level())
+        while len(self.levels) <= n:
+            self.levels.append(cv2.pyrDown(self.levels[-1]))
+        return self.levels[n]
+
+    def proxy_level(self, max_side):
+        """Index of the largest level whose longest side is at most max_side (or the coarsest)"""
+        n = 0
+        while n < self.max_level() and max(self.level(n).shape[:2]) > max_side:
+            n += 1
+        return n
+
+    def proxy(self, max_side):
+        return self.level(self.proxy_level(max_side))
+
+    def level_for_zoom(self, zoom):
+        """Coarsest level that still has at least one pixel per screen pixel at this zoom"""
+        if zoom >= 1:
+            return 0
+        return min(int(math.floor(math.log2(1 / zoom))), self.max_level())
+
+
+def visible_tiles(lo, hi, offset, scale, length, tile=TILE_SIZE):
+    """Indices of the tiles along one axis that cover the screen span [lo, hi].
+
+    offset is the screen position of level pixel 0, scale the screen size of
+    one level pixel and length the level size; empty when the span misses
+    the image.
+    """
+    first = max(0, math.floor((lo - offset) / scale) // tile)
+    last = min((length - 1) // tile, math.floor((hi - offset) / scale) // tile)
+    return range(first, last + 1)
+
+
+class TileCache:
+    """Small LRU cache of rendered tile pixmaps"""
+
+    def __init__(self, capacity=TILE_CACHE_SIZE):
+        self.capacity = capacity
+        self._items = OrderedDict()
+
+    def get(self, key):
+        pix = self._items.get(key)
+        if pix is not None:
+            self._items.move_to_end(key)
+        return pix
+
+    def put(self, key, pix):
+        self._items[key] = pix
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
+class PyramidViewer(QWidget):
+    """Zoomable, pannable image view that renders only the visible pyramid tiles.
+
+    Wheel zooms around the cursor, drag pans, double-click fits the image.
+    """
+
+    # zoom, image x and y at the widget centre (full-res pixels)
+    view_changed = Signal(float, float, float)
+
+    def __init__(self, placeholder="", parent=None):
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self.pyramid = None
+        self.tiles = TileCache()
+        self.zoom = 1.0
+        self.offset = QPointF(0, 0)  # posisi origin gambar di layar
+        self._drag_from = None
+        self._hover = None
+        self._syncing = False
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.WheelFocus)
+
+    def set_image(self, img, keep_view=False):
+        if self.pyramid is not None and img is self.pyramid.levels[0]:
+            return
+        same_shape = self.pyramid is not None and img is not None and img.shape[:2] == self.pyramid.shape[:2]
+        self.pyramid = ImagePyramid(img) if img is not None else None
+        self.tiles.clear()
+        self._hover = None
+        if not (keep_view and same_shape):
+            self.fit()
+        self.update()
+
+    def image(self):
+        return self.pyramid.levels[0] if self.pyramid is not None else None
+
+    def fit(self):
+        if self.pyramid is None:
+            return
+        h, w = self.pyramid.shape[:2]
+        self.zoom = min(self.width() / w, self.height() / h)
+        self.offset = QPointF((self.width() - w * self.zoom) / 2, (self.height() - h * self.zoom) / 2)
+        self._emit_view()
+        self.update()
+
+    def link(self, other):
+        """Keep zoom and pan of two viewers in sync"""
+        self.view_changed.connect(other.set_view)
+        other.view_changed.connect(self.set_view)
+
+    def set_view(self, zoom, cx, cy):
+        if self._syncing:
+            return
+        self._syncing = True
+        self.zoom = zoom
+        self.offset = QPointF(self.width() / 2 - cx * zoom, self.height() / 2 - cy * zoom)
+        self.update()
+        self._syncing = False
+
+    def _emit_view(self):
+        if self._syncing:
+            return
+        self._syncing = True
+        cx = (self.width() / 2 - self.offset.x()) / self.zoom
+        cy = (self.height() / 2 - self.offset.y()) / self.zoom
+        self.view_changed.emit(self.zoom, cx, cy)
+        self._syncing = False
+
+    def image_pos(self, pos):
+        """Widget position -> full-resolution image coordinates"""
+        return (pos.x() - self.offset.x()) / self.zoom, (pos.y() - self.offset.y()) / self.zoom
+
+    def _tile_array(self, source, level, tx, ty):
+        """Pixels of one tile; subclasses can render other sources"""
+        img = self.pyramid.level(level)
+        return img[ty * TILE_SIZE:(ty + 1) * TILE_SIZE, tx * TILE_SIZE:(tx + 1) * TILE_SIZE]
+
+    def _tile_pixmap(self, source, level, tx, ty):
+        key = (source, level, tx, ty)
+        pix = self.tiles.get(key)
+        if pix is None:
+            pix = QPixmap.fromImage(qimg_from_cv(self._tile_array(source, level, tx, ty)))
+            self.tiles.put(key, pix)
+        return pix
+
+    def _draw_tiles(self, painter, source=None, clip=None):
+        level = self.pyramid.level_for_zoom(self.zoom)
+        img = self.pyramid.level(level)
+        lh, lw = img.shape[:2]
+        full_h, full_w = self.pyramid.shape[:2]
+        # Skala dari koordinat level ke layar (ukuran level bisa dibulatkan oleh pyrDown)
+        sx, sy = self.zoom * full_w / lw, self.zoom * full_h / lh
+        view = QRectF(self.rect()) if clip is None else QRectF(clip)
+
+        # Hanya tile yang terlihat di viewport yang dirender
+        cols = visible_tiles(view.left(), view.right(), self.offset.x(), sx, lw)
+        rows = visible_tiles(view.top(), view.bottom(), self.offset.y(), sy, lh)
+
+        painter.save()
+        if clip is not None:
+            painter.setClipRect(clip)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.zoom < 1)
+        for ty in rows:
+            for tx in cols:
+                pix = self._tile_pixmap(source, level, tx, ty)
+                target = QRectF(self.offset.x() + tx * TILE_SIZE * sx, self.offset.y() + ty * TILE_SIZE * sy,
+                                pix.width() * sx, pix.height() * sy)
+                painter.drawPixmap(target, pix, QRectF(pix.rect()))
+        painter.restore()
+
+    def _draw_image(self, painter):
+        self._draw_tiles(painter)
+
+    def _hover_text(self, x, y):
+        value = self.pyramid.levels[0][y, x]
+        return f"({x}, {y}) = {value.tolist()}  |  {self.zoom * 100:.0f}%"
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # Supaya stylesheet (border, background) tetap berlaku di custom widget
+        opt = QStyleOption()
+        opt.initFrom(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, opt, painter, self)
+        if self.pyramid is None:
+            painter.setPen(QColor("#6c757d"))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.placeholder)
+            return
+
+        self._draw_image(painter)
+
+        if self._hover is not None:
+            text = self._hover_text(*self._hover)
+            painter.fillRect(QRectF(0, self.height() - 20, self.width(), 20), QColor(0, 0, 0, 150))
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(QRectF(6, self.height() - 20, self.width() - 12, 20), Qt.AlignVCenter, text)
+
+    def wheelEvent(self, event):
+        if self.pyramid is None:
+            return
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        h, w = self.pyramid.shape[:2]
+        min_zoom = min(self.width() / w, self.height() / h, 1.0) / 2
+        new_zoom = max(min_zoom, min(self.zoom * factor, MAX_ZOOM))
+        pos = event.position()
+        ix, iy = self.image_pos(pos)
+        self.zoom = new_zoom
+        self.offset = QPointF(pos.x() - ix * new_zoom, pos.y() - iy * new_zoom)
+        self._emit_view()
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_from = event.position()
+
+    def mouseMoveEvent(self, event):
+        pos = event.position()
+        if self._drag_from is not None:
+            self.offset += pos - self._drag_from
+            self._drag_from = pos
+            self._emit_view()
+        if self.pyramid is not None:
+            ix, iy = self.image_pos(pos)
+            h, w = self.pyramid.shape[:2]
+            self._hover = (int(ix), int(iy)) if 0 <= ix < w and 0 <= iy < h else None
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_from = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit()
+
+    def leaveEvent(self, event):
+        self._hover = None
+        self.update()
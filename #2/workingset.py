@@ -0,0 +1,192 @@
+import itertools
+import os
+import re
+import shutil
+import tempfile
+import threading
+import weakref
+
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # psutil opsional, fallback ke /proc di Linux
+    psutil = None
+
+# Direktori scratch bisa diatur lewat environment variable ini
+SCRATCH_ENV = "IMGPROC_SCRATCH"
+
+# Array lebih kecil dari ini tetap di RAM (tidak worth dibuat file)
+MMAP_MIN_BYTES = 16 * 1024 * 1024
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+
+
+def process_rss():
+    """Resident set size of this process in bytes, or None if unknown"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def available_memory():
+    """RAM available to new allocations in bytes, or None if unknown"""
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class WorkingSet:
+    """Named image arrays backed by memory-mapped scratch files.
+
+    Stored arrays are read-only views; clean mapped pages can be dropped by the
+    OS instead of being swapped, so several large images can stay open. Use
+    alias() to share storage between names; a file is removed when the last
+    name using it is released. Safe to use from several threads; after
+    close() arrays are no longer stored, only returned. The scratch directory
+    is removed by close(), or when the WorkingSet is garbage collected.
+    """
+
+    def __init__(self, scratch_dir=None, min_bytes=MMAP_MIN_BYTES):
+        base = scratch_dir or os.environ.get(SCRATCH_ENV) or None
+        if base:
+            os.makedirs(base, exist_ok=True)
+        self.dir = tempfile.mkdtemp(prefix="imgproc-", dir=base)
+        self.min_bytes = min_bytes
+        self._arrays = {}
+        self._paths = {}
+        self._refs = {}
+        self._ids = itertools.count()
+        self._lock = threading.RLock()
+        self._closed = False
+        # Tanpa referensi ke self, jadi WorkingSet yang tidak dipakai tetap bisa di-GC
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.dir, True)
+
+    def __contains__(self, key):
+        return key in self._arrays
+
+    def keys(self):
+        return list(self._arrays)
+
+    def get(self, key, default=None):
+        return self._arrays.get(key, default)
+
+    def put(self, key, arr):
+        """Store arr under key and return the stored read-only array"""
+        with self._lock:
+            return self._put(key, arr)
+
+    def _put(self, key, arr):
+        if self._closed:
+            if arr is None:
+                return None
+            stored = np.asarray(arr).view()
+            stored.flags.writeable = False
+            return stored
+        if arr is None:
+            self._release(key)
+            return None
+        if self._arrays.get(key) is arr:
+            return arr
+        for other, stored in self._arrays.items():
+            if stored is arr:
+                return self._alias(key, other)
+        arr = np.asarray(arr)
+        if arr.nbytes < self.min_bytes:
+            stored = arr.view()
+            stored.flags.writeable = False
+            self._release(key)
+            self._arrays[key] = stored
+            return stored
+
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", key)
+        path = os.path.join(self.dir, f"{safe}-{next(self._ids)}.raw")
+        mm = np.memmap(path, dtype=arr.dtype, mode="w+", shape=arr.shape)
+        mm[...] = arr
+        mm.flush()
+        del mm
+        stored = np.memmap(path, dtype=arr.dtype, mode="r", shape=arr.shape)
+        self._release(key)
+        self._arrays[key] = stored
+        self._paths[key] = path
+        self._refs[path] = self._refs.get(path, 0) + 1
+        return stored
+
+    def alias(self, key, source):
+        """Make key share the storage of source (no copy); returns the array"""
+        with self._lock:
+            return self._alias(key, source)
+
+    def _alias(self, key, source):
+        if key == source:
+            return self._arrays.get(key)
+        arr = self._arrays.get(source)
+        self._release(key)
+        if arr is None:
+            return None
+        self._arrays[key] = arr
+        path = self._paths.get(source)
+        if path is not None:
+            self._paths[key] = path
+            self._refs[path] += 1
+        return arr
+
+    def release(self, key):
+        with self._lock:
+            self._release(key)
+
+    def _release(self, key):
+        self._arrays.pop(key, None)
+        path = self._paths.pop(key, None)
+        if path is None:
+            return
+        self._refs[path] -= 1
+        if self._refs[path] == 0:
+            del self._refs[path]
+            try:
+                # Di POSIX file boleh dihapus walau masih di-map oleh view lama
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for key in list(self._arrays):
+                self._release(key)
+            self._cleanup()
+
+    def memory_usage(self):
+        """Bytes held in RAM arrays, in mapped files, and the process RSS"""
+        with self._lock:
+            ram = {id(a): a.nbytes for k, a in self._arrays.items() if k not in self._paths}
+            seen = {path: self._arrays[key].nbytes for key, path in self._paths.items()}
+        in_ram = sum(ram.values())
+        return {
+            "in_ram": in_ram,
+            "mapped": sum(seen.values()),
+            "files": len(seen),
+            "rss": process_rss(),
+        }
+
+    def describe(self):
+        usage = self.memory_usage()
+        rss = format_bytes(usage["rss"]) if usage["rss"] is not None else "n/a"
+        return (f"RAM arrays: {format_bytes(usage['in_ram'])} | "
+                f"Mapped: {format_bytes(usage['mapped'])} ({usage['files']} files) | RSS: {rss}")